@@ -0,0 +1,89 @@
+"""Micro-benchmark of per-event field extraction.
+
+Runs offline against the recorded payloads in benchmarks/fixtures. Each
+payload is extracted by fields.py and by the try/except chains it
+replaced (benchmarks/legacy_extraction.py), side by side:
+
+    python benchmarks/bench_extraction.py [--number N]
+
+The legacy column needs arrow installed and is left out without it.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import timeit
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PACKAGE_DIR = os.path.join(HERE, os.pardir, "custom_components", "nhl")
+
+TEAM = "NYR"
+SCOREBOARD_STATES = ("pre", "in", "intermission", "ot", "shootout", "post")
+
+
+def load_package():
+    """Import the integration's modules without running its Home Assistant setup."""
+    package = types.ModuleType("nhl")
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules.setdefault("nhl", package)
+    return importlib.import_module("nhl.fields")
+
+
+def load_fixture(name):
+    with open(os.path.join(HERE, "fixtures", name), encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def load_legacy():
+    """Return the legacy extractor, or None if arrow is not installed."""
+    sys.path.insert(0, HERE)
+    try:
+        return importlib.import_module("legacy_extraction")
+    except ImportError:
+        return None
+
+
+def per_event(call, number):
+    """Return the mean microseconds per call, or None without a call."""
+    if call is None:
+        return None
+    return timeit.timeit(call, number=number) / number * 1e6
+
+
+def report(label, before, after):
+    if before is None:
+        print("%-30s %12s %10.1f us" % (label, "-", after))
+    else:
+        print("%-30s %10.1f us %10.1f us %8.2fx" % (label, before, after, before / after))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    fields = load_package()
+    legacy = load_legacy()
+    print("%-30s %13s %13s %9s" % ("", "try/except", "fields.py", "speedup"))
+    for state in SCOREBOARD_STATES:
+        events = fields.index_events(load_fixture("scoreboard_%s.json" % state), {TEAM})
+        event = events[TEAM]
+        report(
+            "scoreboard event (%s)" % state,
+            per_event(legacy and (lambda: legacy.extract_scoreboard_event(event, TEAM)), args.number),
+            per_event(lambda: fields.extract_scoreboard_event(event, TEAM), args.number),
+        )
+
+    team_data = load_fixture("team_off_day.json")["team"]
+    oppo_data = load_fixture("team_opponent.json")["team"]
+    report(
+        "team nextEvent",
+        per_event(legacy and (lambda: legacy.extract_schedule_event(team_data, oppo_data, TEAM)), args.number),
+        per_event(lambda: fields.extract_schedule_event(team_data, oppo_data, TEAM), args.number),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Import-time benchmark of the integration's modules.
+
+Each run imports one module in a fresh interpreter that has already loaded
+what Home Assistant itself imports before setting up an integration, so the
+time reported is what the integration adds to boot. For each module it
+reports the best and median time over the runs and the modules outside the
+integration that it pulled in:
+
+    python benchmarks/bench_import.py [--number N] [--module NAME] [--slowest N]
+
+--slowest lists the integration's own modules that took longest to import,
+as measured by python -X importtime.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CUSTOM_COMPONENTS = os.path.join(HERE, os.pardir, "custom_components")
+
+MODULES = ("nhl", "nhl.sensor", "nhl.config_flow", "nhl.diagnostics")
+
+# Already imported by Home Assistant by the time it loads an integration
+BASELINE = (
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.components.sensor",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.storage",
+    "homeassistant.helpers.update_coordinator",
+)
+
+PROBE = """
+import importlib, json, sys, time
+for name in %r:
+    importlib.import_module(name)
+before = set(sys.modules)
+started = time.perf_counter()
+importlib.import_module(%r)
+elapsed = time.perf_counter() - started
+added = sorted(
+    name for name in set(sys.modules) - before
+    if name.split(".")[0] != "nhl" and "." not in name
+)
+print(json.dumps({"seconds": elapsed, "added": added}))
+"""
+
+
+def run(module, importtime=False):
+    """Import module in a new interpreter; return its probe result and stderr."""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", PROBE % (BASELINE, module)]
+    result = subprocess.run(
+        command,
+        cwd=CUSTOM_COMPONENTS,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1]), result.stderr
+
+
+def slowest(module, count):
+    """Return the integration modules with the largest cumulative import time."""
+    _, stderr = run(module, importtime=True)
+    timings = []
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[2].strip().startswith("nhl"):
+            continue
+        timings.append((int(parts[1]), parts[2].strip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10)
+    parser.add_argument("--module", choices=MODULES, action="append")
+    parser.add_argument("--slowest", type=int, default=0)
+    args = parser.parse_args()
+
+    for module in args.module or MODULES:
+        results = [run(module)[0] for _ in range(args.number)]
+        seconds = [result["seconds"] for result in results]
+        print(
+            "%-16s %8.1f ms best %8.1f ms median   new packages: %s"
+            % (
+                module,
+                min(seconds) * 1e3,
+                statistics.median(seconds) * 1e3,
+                ", ".join(results[0]["added"]) or "-",
+            )
+        )
+        for cumulative, name in slowest(module, args.slowest):
+            print("    %-28s %8.1f ms" % (name, cumulative / 1e3))
+
+
+if __name__ == "__main__":
+    main()
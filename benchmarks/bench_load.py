@@ -0,0 +1,108 @@
+"""Load test: many teams polling the local ESPN stand-in at live cadence.
+
+Starts espn_standin in-process, sets up one coordinator per team pointed at
+it through the endpoint overrides, and lets each refresh on the interval
+its planner picks for --duration seconds. Reports what the stand-in
+served, refresh latency and the CPU time the integration used.
+
+    python benchmarks/bench_load.py [--teams 32] [--duration 120] [--tick 5]
+
+The stand-in options (--latency, --error-rate, ...) are accepted too.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, os.pardir, "custom_components"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+import espn_standin  # noqa: E402
+from nhl.coordinator import AlertsDataUpdateCoordinator  # noqa: E402
+from nhl.const import (  # noqa: E402
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SCOREBOARD_ENDPOINT,
+    CONF_TEAM_ENDPOINT,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DOMAIN,
+    HUB,
+)
+
+
+async def poll(coordinator, until, durations, states):
+    """Refresh like the coordinator's own timer would until the deadline."""
+    while time.monotonic() < until:
+        started = time.monotonic()
+        await coordinator.async_refresh()
+        durations.append(time.monotonic() - started)
+        if coordinator.data is not None:
+            states[coordinator.data.state] += 1
+        await asyncio.sleep(
+            min(coordinator.update_interval.total_seconds(), max(0, until - time.monotonic()))
+        )
+
+
+async def main():
+    parser = espn_standin.parser()
+    parser.description = __doc__.splitlines()[0]
+    parser.add_argument("--teams", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=120.0)
+    parser.add_argument("--requests-per-minute", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    standin = espn_standin.StandIn(args)
+    runner = await standin.start(args.host, args.port)
+    base = "http://%s:%s" % (args.host, args.port)
+    teams = sorted(standin.timeline.teams)[: args.teams]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinators = [
+            AlertsDataUpdateCoordinator(
+                hass,
+                {
+                    "team_id": team,
+                    "name": "load_%s" % team,
+                    "timeout": 30,
+                    CONF_SCOREBOARD_ENDPOINT: base + espn_standin.SCOREBOARD_PATH,
+                    CONF_TEAM_ENDPOINT: base + espn_standin.TEAM_PATH,
+                    CONF_REQUESTS_PER_MINUTE: args.requests_per_minute or DEFAULT_REQUESTS_PER_MINUTE,
+                },
+                30,
+            )
+            for team in teams
+        ]
+
+        durations = []
+        states = Counter()
+        cpu = time.process_time()
+        until = time.monotonic() + args.duration
+        await asyncio.gather(*(poll(c, until, durations, states) for c in coordinators))
+        cpu = time.process_time() - cpu
+
+        limiter = hass.data[DOMAIN][HUB].limiter.as_dict()
+        await hass.data[DOMAIN][HUB].async_close()
+        await hass.async_stop(force=True)
+    await runner.cleanup()
+
+    durations.sort()
+    print("teams            %d over %.0f s (timeline step %d)" % (len(teams), args.duration, standin.timeline.step))
+    print("refreshes        %d (%s)" % (len(durations), ", ".join("%s=%d" % i for i in sorted(states.items(), key=str))))
+    print("refresh mean     %.2f ms" % (statistics.mean(durations) * 1000))
+    print("refresh p95      %.2f ms" % (durations[int(len(durations) * 0.95)] * 1000))
+    print("refresh max      %.2f ms" % (durations[-1] * 1000))
+    print("cpu              %.2f s (%.1f%% of one core, stand-in included)" % (cpu, cpu / args.duration * 100))
+    print("limiter          %s" % limiter)
+    for key, value in sorted(standin.stats.items()):
+        print("%-16s %d" % (key, value))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
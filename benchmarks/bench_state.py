@@ -0,0 +1,210 @@
+"""Offline benchmark of a full poll, from response body to sensor attributes.
+
+Every game state has a payload in benchmarks/fixtures. The integration runs
+unmodified against them; only the HTTP session is replaced by one that
+answers from the fixture files. For each state the benchmark reports:
+
+  cold     async_get_state when every document is new (decode + extract)
+  warm     async_get_state when every document is byte-identical
+  attrs    building the attribute mapping and reading extra_state_attributes
+
+with the time per call, and the peak and retained memory of one call as
+seen by tracemalloc.
+
+    python benchmarks/bench_state.py [--number N] [--state NAME]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+sys.path.insert(0, os.path.join(HERE, os.pardir, "custom_components"))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from nhl.coordinator import AlertsDataUpdateCoordinator, async_get_state, build_attributes  # noqa: E402
+from nhl.const import (  # noqa: E402
+    API_SCOREBOARD_ENDPOINT,
+    API_TEAM_ENDPOINT,
+    CONF_REQUESTS_PER_MINUTE,
+    COORDINATOR,
+    DOMAIN,
+)
+from nhl.sensor import NHLScoresSensor  # noqa: E402
+
+TEAM = "NYR"
+OPPONENT = "NYI"
+UNLIMITED = 10 ** 9
+
+# state -> (scoreboard fixture, team fixture, opponent fixture)
+STATES = {
+    "pre": ("scoreboard_pre.json", None, None),
+    "in": ("scoreboard_in.json", None, None),
+    "intermission": ("scoreboard_intermission.json", None, None),
+    "overtime": ("scoreboard_ot.json", None, None),
+    "shootout": ("scoreboard_shootout.json", None, None),
+    "post": ("scoreboard_post.json", None, None),
+    "off_day": ("scoreboard_off_day.json", "team_off_day.json", "team_opponent.json"),
+    "off_season": ("scoreboard_off_season.json", "team_off_season.json", None),
+}
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as fp:
+        return fp.read()
+
+
+class FixtureResponse:
+    """Just enough of aiohttp.ClientResponse for NHLApiClient."""
+
+    def __init__(self, body):
+        self.status = 200 if body is not None else 404
+        self.headers = {}
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FixtureSession:
+    """Stand-in for the pooled session that answers from fixture files."""
+
+    closed = False
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+
+    def get(self, url, headers=None):
+        return FixtureResponse(self.bodies.get(url))
+
+    async def close(self):
+        self.closed = True
+
+
+def fixture_bodies(state):
+    scoreboard, team, opponent = STATES[state]
+    bodies = {API_SCOREBOARD_ENDPOINT: read_fixture(scoreboard)}
+    if team is not None:
+        bodies[API_TEAM_ENDPOINT + TEAM] = read_fixture(team)
+    if opponent is not None:
+        bodies[API_TEAM_ENDPOINT + OPPONENT] = read_fixture(opponent)
+    return bodies
+
+
+def forget(hub, bodies):
+    """Make the next poll see every document as new."""
+    hub._invalidate_scoreboard()
+    for url in bodies:
+        hub.client.invalidate(url)
+
+
+def rewind(hub):
+    """Make the next poll go back to the session instead of the last tick."""
+    hub._fetched_at = None
+
+
+async def timed(number, call, before=None):
+    """Return the mean seconds per awaited call, excluding before()."""
+    total = 0.0
+    for _ in range(number):
+        if before is not None:
+            before()
+        started = time.perf_counter()
+        await call()
+        total += time.perf_counter() - started
+    return total / number
+
+
+async def traced(call, before=None):
+    """Return (peak, retained) bytes allocated by one awaited call."""
+    if before is not None:
+        before()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = await call()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - baseline, current - baseline
+
+
+def report(state, label, seconds, memory):
+    peak, retained = memory
+    print(
+        "%-13s %-6s %10.1f us %10.1f KiB peak %8.1f KiB retained"
+        % (state, label, seconds * 1e6, peak / 1024, retained / 1024)
+    )
+
+
+async def bench_state(hass, state, number):
+    bodies = fixture_bodies(state)
+    # The request budget would throttle the loop, not measure anything
+    config = {
+        "team_id": TEAM,
+        "name": "bench_%s" % state,
+        "timeout": 30,
+        CONF_REQUESTS_PER_MINUTE: UNLIMITED,
+    }
+    coordinator = AlertsDataUpdateCoordinator(hass, config, 30)
+    hub = coordinator.hub
+    hub.client._session = FixtureSession(bodies)
+
+    # First poll fills the team cache and gives the entity its data
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success, state
+    entry = SimpleNamespace(entry_id=config["name"], data=config)
+    hass.data[DOMAIN][entry.entry_id] = {COORDINATOR: coordinator}
+    sensor = NHLScoresSensor(hass, entry)
+    previous = coordinator.data
+
+    async def cold():
+        return await async_get_state(hub, config)
+
+    async def warm():
+        return await async_get_state(hub, config, previous)
+
+    async def attrs():
+        coordinator.attributes = build_attributes(previous)
+        return dict(sensor.extra_state_attributes)
+
+    before_cold = lambda: forget(hub, bodies)  # noqa: E731
+    before_warm = lambda: rewind(hub)  # noqa: E731
+    report(state, "cold", await timed(number, cold, before_cold), await traced(cold, before_cold))
+    report(state, "warm", await timed(number, warm, before_warm), await traced(warm, before_warm))
+    report(state, "attrs", await timed(number, attrs), await traced(attrs))
+
+    hub.untrack(TEAM)
+    del hass.data[DOMAIN][entry.entry_id]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--state", choices=sorted(STATES), action="append")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for state in args.state or STATES:
+            await bench_state(hass, state, args.number)
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
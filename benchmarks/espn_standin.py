@@ -0,0 +1,422 @@
+"""Local stand-in for site.api.espn.com that replays a game-night timeline.
+
+Serves the endpoints the integration uses:
+
+    /apis/site/v2/sports/hockey/nhl/scoreboard
+    /apis/site/v2/sports/hockey/nhl/scoreboard?dates=YYYYMMDD-YYYYMMDD
+    /apis/site/v2/sports/hockey/nhl/teams/{abbreviation}
+
+The timeline moves one step every --tick seconds. By default it is built
+from the fixtures in benchmarks/fixtures: every game on the night starts
+as scheduled, then runs its clock down, scores goals, goes through the
+intermissions and, when tied, overtime and a shootout, before going final.
+A date-ranged scoreboard repeats the night's games, still scheduled, on
+every following day of the range.
+With --timeline DIR the scoreboards in DIR (sorted by file name) are
+replayed instead, one per step.
+
+Responses carry an ETag and Last-Modified and answer conditional requests
+with 304. --latency/--jitter delay every answer and --error-rate replaces
+a share of them with one of --error-status. GET /_stats returns the
+request counters, POST /_control changes latency and errors at runtime,
+e.g. {"latency": 0.5, "error_rate": 0.2}.
+
+Point the integration at it from configuration.yaml:
+
+    sensor:
+      - platform: nhl
+        team_id: NYR
+        scoreboard_endpoint: http://127.0.0.1:8765/apis/site/v2/sports/hockey/nhl/scoreboard
+        team_endpoint: http://127.0.0.1:8765/apis/site/v2/sports/hockey/nhl/teams/
+
+    python benchmarks/espn_standin.py [--port 8765] [--tick 5]
+"""
+import argparse
+import asyncio
+import copy
+import datetime
+import hashlib
+import json
+import os
+import random
+import time
+from collections import Counter
+from email.utils import formatdate
+
+from aiohttp import web
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+
+SCOREBOARD_PATH = "/apis/site/v2/sports/hockey/nhl/scoreboard"
+TEAM_PATH = "/apis/site/v2/sports/hockey/nhl/teams/"
+
+PERIOD_LENGTH = 1200
+OVERTIME_LENGTH = 300
+ORDINALS = {1: "1st", 2: "2nd", 3: "3rd", 4: "OT"}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def iso_minutes(timestamp):
+    return time.strftime("%Y-%m-%dT%H:%MZ", time.gmtime(timestamp))
+
+
+class Game:
+    """One simulated game, advanced a step at a time."""
+
+    def __init__(self, template, start_step, seed, clock_step, intermission_steps):
+        self.template = template
+        self.start_step = start_step
+        self.random = random.Random(seed)
+        self.clock_step = clock_step
+        self.intermission_steps = intermission_steps
+        self.state = "pre"
+        self.name = "STATUS_SCHEDULED"
+        self.period = 0
+        self.clock = PERIOD_LENGTH
+        self.goals = [[], []]
+        self.paused = 0
+
+    def advance(self, step):
+        """Move the game on by one step of the timeline."""
+        if self.state == "post" or step < self.start_step:
+            return
+        if self.state == "pre":
+            self.state, self.name, self.period = "in", "STATUS_IN_PROGRESS", 1
+            for goals in self.goals:
+                goals.append(0)
+            return
+        if self.paused:
+            self.paused -= 1
+            if not self.paused:
+                self._next_period()
+            return
+        if self.period == 5:
+            self.goals[self.random.randrange(2)][-1] += 1
+            self._final()
+            return
+
+        self.clock = max(0, self.clock - self.clock_step)
+        if self.random.random() < 0.04 * self.clock_step / 60:
+            self.goals[self.random.randrange(2)][-1] += 1
+            if self.period == 4:
+                self._final()
+                return
+        if self.clock == 0:
+            if self.period == 3 and self.score(0) != self.score(1) or self.period == 4:
+                if self.period == 4:
+                    # Still tied after overtime; decide it in a shootout
+                    self.period, self.name = 5, "STATUS_IN_PROGRESS"
+                    for goals in self.goals:
+                        goals.append(0)
+                    return
+                self._final()
+                return
+            self.name = "STATUS_END_PERIOD"
+            self.paused = self.intermission_steps
+
+    def _next_period(self):
+        self.period += 1
+        self.name = "STATUS_IN_PROGRESS"
+        self.clock = OVERTIME_LENGTH if self.period == 4 else PERIOD_LENGTH
+        for goals in self.goals:
+            goals.append(0)
+
+    def _final(self):
+        self.state, self.name, self.clock = "post", "STATUS_FINAL", 0
+
+    def score(self, index):
+        goals = self.goals[index]
+        if self.period == 5 and len(goals) == 5:
+            # The shootout winner is credited with a single goal
+            return sum(goals[:4]) + (1 if goals[4] > self.goals[1 - index][4] else 0)
+        return sum(goals)
+
+    def detail(self):
+        if self.state == "pre":
+            return "Scheduled", self.template["status"]["type"]["shortDetail"]
+        if self.state == "post":
+            suffix = {4: "/OT", 5: "/SO"}.get(self.period, "")
+            return "Final" + suffix, "Final" + suffix
+        if self.period == 5:
+            return "Shootout", "SO"
+        ordinal = ORDINALS[self.period]
+        if self.name == "STATUS_END_PERIOD":
+            return "End of %s" % ordinal, "End of %s" % ordinal
+        clock = "%d:%02d" % divmod(self.clock, 60)
+        return "%s - %s" % (clock, ordinal), "%s - %s" % (clock, ordinal)
+
+    def event(self, post_status):
+        """Return the scoreboard event for the game as it stands."""
+        event = copy.deepcopy(self.template)
+        competition = event["competitions"][0]
+        detail, short_detail = self.detail()
+        status = {
+            "clock": float(self.clock),
+            "displayClock": "%d:%02d" % divmod(self.clock, 60),
+            "period": self.period,
+            "type": {
+                "id": "1",
+                "name": self.name,
+                "state": self.state,
+                "completed": self.state == "post",
+                "description": detail,
+                "detail": detail,
+                "shortDetail": short_detail,
+            },
+        }
+        if self.state == "post":
+            status["featuredAthletes"] = copy.deepcopy(post_status["featuredAthletes"])
+        event["status"] = competition["status"] = status
+        if self.state != "pre":
+            for index, competitor in enumerate(competition["competitors"]):
+                competitor["score"] = str(self.score(index))
+                competitor["linescores"] = [{"value": float(v)} for v in self.goals[index]]
+            competition.pop("odds", None)
+        return event
+
+
+class Timeline:
+    """Scoreboards for every step of the night, built lazily."""
+
+    def __init__(self, args):
+        self.started = time.time()
+        self.tick = args.tick
+        self.step = -1
+        self.replay = None
+        if args.timeline:
+            names = sorted(n for n in os.listdir(args.timeline) if n.endswith(".json"))
+            self.replay = [os.path.join(args.timeline, n) for n in names]
+
+        base = load_fixture("scoreboard_pre.json")
+        self.post_status = load_fixture("scoreboard_post.json")["events"][0]["status"]
+        self.scoreboard = base
+        self.games = []
+        for index, event in enumerate(base["events"]):
+            start_step = args.start_after + index % args.waves * args.wave_gap
+            event["date"] = event["competitions"][0]["date"] = iso_minutes(
+                self.started + start_step * self.tick
+            )
+            self.games.append(
+                Game(event, start_step, args.seed + index, args.clock_step, args.intermission)
+            )
+        self.teams = self._team_documents()
+        self.documents = {}
+
+    def _team_documents(self):
+        """Return a team document for every team on the night, keyed by abbreviation."""
+        template = load_fixture("team_off_day.json")["team"]
+        documents = {}
+        for game in self.games:
+            competition = game.template["competitions"][0]
+            for competitor in competition["competitors"]:
+                team = competitor["team"]
+                abbr = team["abbreviation"].lower()
+                document = copy.deepcopy(template)
+                for key in ("id", "uid", "location", "name", "abbreviation", "displayName",
+                            "shortDisplayName", "color", "alternateColor"):
+                    document[key] = team[key]
+                document["nickname"] = team["name"]
+                document["logos"] = [
+                    {"href": logo["href"].replace("/nyr.png", "/%s.png" % abbr), "rel": logo["rel"]}
+                    for logo in template["logos"]
+                ]
+                next_event = document["nextEvent"][0]
+                next_event.update(
+                    id=game.template["id"],
+                    date=game.template["date"],
+                    name=game.template["name"],
+                    shortName=game.template["shortName"],
+                )
+                next_competition = next_event["competitions"][0]
+                next_competition["date"] = game.template["date"]
+                for slot, source in zip(next_competition["competitors"], competition["competitors"]):
+                    slot["id"] = source["id"]
+                    slot["team"] = {
+                        key: source["team"][key]
+                        for key in ("id", "uid", "location", "abbreviation", "displayName",
+                                    "shortDisplayName", "color", "alternateColor", "links")
+                    }
+                    slot["team"]["logos"] = [{"href": source["team"]["logo"], "rel": ["full", "default"]}]
+                documents[team["abbreviation"]] = {"team": document}
+        return documents
+
+    def current_step(self):
+        return int((time.time() - self.started) / self.tick)
+
+    def catch_up(self):
+        """Advance every game to the current step."""
+        target = self.current_step()
+        while self.step < target:
+            self.step += 1
+            for game in self.games:
+                game.advance(self.step)
+            self.documents.clear()
+
+    def scoreboard_body(self):
+        self.catch_up()
+        if "scoreboard" not in self.documents:
+            if self.replay is not None:
+                path = self.replay[min(self.step, len(self.replay) - 1)]
+                with open(path, "rb") as fp:
+                    body = fp.read()
+            else:
+                scoreboard = dict(self.scoreboard)
+                scoreboard["events"] = [game.event(self.post_status) for game in self.games]
+                body = json.dumps(scoreboard, separators=(",", ":")).encode()
+            self.documents["scoreboard"] = document(body, self.started + self.step * self.tick)
+        return self.documents["scoreboard"]
+
+    def schedule_body(self, dates):
+        """Return the night's games as scheduled for each day after the first in dates."""
+        first, _, last = dates.partition("-")
+        try:
+            days = (
+                datetime.datetime.strptime(last or first, "%Y%m%d")
+                - datetime.datetime.strptime(first, "%Y%m%d")
+            ).days
+        except ValueError:
+            return None
+        key = "schedule:%s" % days
+        if key not in self.documents:
+            events = []
+            for day in range(1, days + 1):
+                for game in self.games:
+                    event = copy.deepcopy(game.template)
+                    event["id"] = "%s-%s" % (event["id"], day)
+                    start = self.started + (game.start_step * self.tick) + day * 86400
+                    event["date"] = event["competitions"][0]["date"] = iso_minutes(start)
+                    events.append(event)
+            scoreboard = dict(self.scoreboard)
+            scoreboard["events"] = events
+            body = json.dumps(scoreboard, separators=(",", ":")).encode()
+            self.documents[key] = document(body, self.started)
+        return self.documents[key]
+
+    def team_body(self, abbreviation):
+        if abbreviation not in self.teams:
+            return None
+        if abbreviation not in self.documents:
+            body = json.dumps(self.teams[abbreviation], separators=(",", ":")).encode()
+            self.documents[abbreviation] = document(body, self.started)
+        return self.documents[abbreviation]
+
+
+def document(body, modified):
+    """Return a body with the validators it is served under."""
+    return {
+        "body": body,
+        "etag": '"%s"' % hashlib.sha1(body).hexdigest(),
+        "last_modified": formatdate(modified, usegmt=True),
+    }
+
+
+class StandIn:
+    """The aiohttp application and its knobs."""
+
+    def __init__(self, args):
+        self.timeline = Timeline(args)
+        self.latency = args.latency
+        self.jitter = args.jitter
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.stats = Counter()
+        self.random = random.Random(args.seed)
+
+    def application(self):
+        app = web.Application()
+        app.router.add_get(SCOREBOARD_PATH, self.scoreboard)
+        app.router.add_get(TEAM_PATH + "{abbreviation}", self.team)
+        app.router.add_get("/_stats", self.get_stats)
+        app.router.add_post("/_control", self.control)
+        return app
+
+    async def start(self, host, port):
+        runner = web.AppRunner(self.application())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        return runner
+
+    async def answer(self, request, name, doc):
+        self.stats["requests"] += 1
+        self.stats["requests:" + name] += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            status = self.random.choice(self.error_status)
+            self.stats["status:%s" % status] += 1
+            return web.Response(status=status)
+        if doc is None:
+            self.stats["status:404"] += 1
+            return web.Response(status=404)
+
+        headers = {"ETag": doc["etag"], "Last-Modified": doc["last_modified"]}
+        if request.headers.get("If-None-Match") == doc["etag"]:
+            self.stats["status:304"] += 1
+            return web.Response(status=304, headers=headers)
+        self.stats["status:200"] += 1
+        self.stats["bytes"] += len(doc["body"])
+        return web.Response(body=doc["body"], content_type="application/json", headers=headers)
+
+    async def scoreboard(self, request):
+        if "dates" in request.query:
+            return await self.answer(request, "schedule", self.timeline.schedule_body(request.query["dates"]))
+        return await self.answer(request, "scoreboard", self.timeline.scoreboard_body())
+
+    async def team(self, request):
+        abbreviation = request.match_info["abbreviation"].upper()
+        return await self.answer(request, "team", self.timeline.team_body(abbreviation))
+
+    async def get_stats(self, request):
+        stats = dict(self.stats)
+        stats["step"] = self.timeline.current_step()
+        return web.json_response(stats)
+
+    async def control(self, request):
+        changes = await request.json()
+        for key in ("latency", "jitter", "error_rate", "error_status"):
+            if key in changes:
+                setattr(self, key, changes[key])
+        return web.json_response({"ok": True})
+
+
+def parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick", type=float, default=5.0, help="seconds per timeline step")
+    parser.add_argument("--clock-step", type=int, default=60, help="game seconds per step")
+    parser.add_argument("--intermission", type=int, default=3, help="steps per intermission")
+    parser.add_argument("--start-after", type=int, default=2, help="steps before the first puck drop")
+    parser.add_argument("--waves", type=int, default=3, help="groups of games with staggered starts")
+    parser.add_argument("--wave-gap", type=int, default=12, help="steps between groups")
+    parser.add_argument("--timeline", help="directory of scoreboard JSON files to replay instead")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every answer")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of answers that fail")
+    parser.add_argument("--error-status", type=int, nargs="+", default=[500, 503, 429])
+    parser.add_argument("--seed", type=int, default=1)
+    return parser
+
+
+async def serve(args):
+    standin = StandIn(args)
+    runner = await standin.start(args.host, args.port)
+    print("Serving the NHL scoreboard on http://%s:%s%s" % (args.host, args.port, SCOREBOARD_PATH))
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve(parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
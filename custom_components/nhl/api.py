@@ -0,0 +1,165 @@
+""" ESPN API client """
+import hashlib
+import json
+import logging
+
+import aiohttp
+from aiohttp import hdrs
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .const import (
+    CONNECTION_LIMIT,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    REQUEST_TIMEOUT,
+    USER_AGENT,
+)
+from .stats import RequestStats
+
+_LOGGER = logging.getLogger(__name__)
+
+HEADERS = {"User-Agent": USER_AGENT, "Accept": "application/ld+json"}
+
+# orjson decodes the full scoreboard several times faster than the stdlib
+json_loads = json.loads if orjson is None else orjson.loads
+
+
+class ApiError(Exception):
+    """ESPN answered with a server error, asked us to slow down, or sent a document we can't read."""
+
+    def __init__(self, url: str, status: int, reason: str = None):
+        """Initialize."""
+        super().__init__("Getting %s returned %s" % (url, reason or status))
+        self.status = status
+
+
+class NHLApiClient:
+    """Fetch ESPN documents over one pooled, keep-alive session.
+
+    Validators (ETag / Last-Modified) and a digest of the last body are kept
+    per URL so unchanged documents are answered from memory, and each URL
+    carries a revision number that only moves when its content changes.
+    """
+
+    def __init__(self, loads=None):
+        """Initialize.
+
+        loads decodes a response body; it defaults to orjson when installed.
+        """
+        self._session = None
+        self._cache = {}
+        # Kept apart from _cache so invalidate() never moves a revision back
+        self._revisions = {}
+        self._loads = json_loads if loads is None else loads
+        self.stats = RequestStats()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, opening it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                trace_configs=[self.stats.trace_config()],
+            )
+        return self._session
+
+    async def async_get_json(self, url: str, transform=None, key: str = None):
+        """Return the decoded JSON document at url, or None on an error answer.
+
+        Server errors and 429s raise ApiError instead, since they say
+        nothing about the document and are worth retrying later. So does a
+        body that is not JSON, or that lacks key when one is given, as
+        ESPN sometimes answers with an error page.
+
+        A 304 or a byte-identical body returns the previously decoded
+        document without decoding it again. transform, if given, is applied
+        once after decoding and only its result is kept, so callers that
+        need a small part of a large document do not hold on to the rest.
+        """
+        session = self._get_session()
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached["etag"] is not None:
+                headers[hdrs.IF_NONE_MATCH] = cached["etag"]
+            if cached["last_modified"] is not None:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached["last_modified"]
+
+        async with session.get(url, headers=headers) as r:
+            _LOGGER.debug("Getting %s returned %s" % (url, r.status))
+            if r.status == 304 and cached is not None:
+                self.stats.count("not_modified")
+                return cached["payload"]
+            if r.status == 429 or r.status >= 500:
+                raise ApiError(url, r.status)
+            if r.status != 200:
+                return None
+            with self.stats.stage("read"):
+                body = await r.read()
+            etag = r.headers.get(hdrs.ETAG)
+            last_modified = r.headers.get(hdrs.LAST_MODIFIED)
+        self.stats.count("bytes", len(body))
+
+        digest = hashlib.sha1(body).digest()
+        if cached is not None and cached["digest"] == digest:
+            self.stats.count("unchanged_bodies")
+            cached["etag"] = etag
+            cached["last_modified"] = last_modified
+            return cached["payload"]
+
+        with self.stats.stage("decode"):
+            try:
+                payload = self._loads(body)
+            except ValueError as error:
+                raise ApiError(url, 200, "a body that is not JSON") from error
+        if key is not None and (not isinstance(payload, dict) or key not in payload):
+            raise ApiError(url, 200, "a document without %r" % key)
+        _LOGGER.debug(
+            "Decoded %s bytes from %s in %.2f ms"
+            % (len(body), url, self.stats.last["decode"] * 1000)
+        )
+        if transform is not None:
+            with self.stats.stage("transform"):
+                payload = transform(payload)
+
+        # A new body whose useful part is unchanged keeps its revision
+        if cached is not None and cached["payload"] == payload:
+            self.stats.count("unchanged_payloads")
+            cached.update(etag=etag, last_modified=last_modified, digest=digest)
+            return cached["payload"]
+        self._cache[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "digest": digest,
+            "payload": payload,
+        }
+        self._revisions[url] = self._revisions.get(url, 0) + 1
+        return payload
+
+    def invalidate(self, url: str) -> None:
+        """Forget what is cached for url so the next fetch is unconditional.
+
+        The revision is kept: the next document gets a new one, so nothing
+        built from the old document mistakes it for unchanged.
+        """
+        self._cache.pop(url, None)
+
+    def revision(self, url: str) -> int:
+        """Return a number that changes whenever the document at url changes."""
+        return self._revisions.get(url, 0)
+
+    async def async_close(self) -> None:
+        """Close the pooled session and its connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
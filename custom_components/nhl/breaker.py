@@ -0,0 +1,95 @@
+""" Circuit breaker for the ESPN endpoints """
+import logging
+import random
+import time
+
+from .const import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_OPEN_TIME,
+    BREAKER_OPEN_TIME,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to an endpoint that keeps failing."""
+
+    def __init__(self, name: str, retry_in: float):
+        """Initialize."""
+        super().__init__("%s is failing; next try in %.0f seconds" % (name, retry_in))
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stop requesting an endpoint after repeated failures.
+
+    After BREAKER_FAILURE_THRESHOLD failures in a row the circuit opens and
+    requests fail fast. Once the open time has passed, one request is let
+    through as a probe (half-open): if it succeeds the circuit closes, if
+    it fails the circuit opens again for twice as long, up to
+    BREAKER_MAX_OPEN_TIME, with some jitter so entries do not retry in step.
+    """
+
+    def __init__(self, name: str):
+        """Initialize."""
+        self.name = name
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._retry_at = 0.0
+        self._probing = False
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may go out now."""
+        if self.state == CLOSED:
+            return
+        retry_in = self._retry_at - time.monotonic()
+        if self.state == OPEN and retry_in <= 0:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            _LOGGER.debug("Probing %s" % (self.name))
+            self._probing = True
+            return
+        raise CircuitOpenError(self.name, max(retry_in, 0))
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        if self.state != CLOSED:
+            _LOGGER.info("%s is answering again" % (self.name))
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit when there are too many."""
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            open_time = min(BREAKER_MAX_OPEN_TIME, BREAKER_OPEN_TIME * 2 ** self.opened)
+            open_time *= random.uniform(0.8, 1.2)
+            self.opened += 1
+            self.state = OPEN
+            self._retry_at = time.monotonic() + open_time
+            _LOGGER.warning(
+                "%s failed %s times in a row; pausing requests for %.0f seconds"
+                % (self.name, self.failures, open_time)
+            )
+
+    def release_probe(self) -> None:
+        """Allow a new probe when the last one ended without an answer."""
+        self._probing = False
+
+    def as_dict(self) -> dict:
+        """Return the breaker's state, for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "times_opened": self.opened,
+            "retry_in": round(max(self._retry_at - time.monotonic(), 0), 1) if self.state != CLOSED else None,
+        }
@@ -0,0 +1,120 @@
+""" Persistent NHL team metadata and snapshot caches """
+import asyncio
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .model import GameSnapshot
+from .const import (
+    STORAGE_KEY_SNAPSHOTS,
+    STORAGE_KEY_TEAMS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def team_metadata(team: dict) -> dict:
+    """Trim an API_TEAM_ENDPOINT team document to its slow-changing fields.
+
+    The result keeps the document's shape so it can be read like the original.
+    """
+    try:
+        record = [{"summary": team["record"]["items"][0]["summary"]}]
+    except (KeyError, IndexError, TypeError):
+        record = []
+    venue = team.get("franchise", {}).get("venue", {})
+
+    return {
+        "id": team.get("id"),
+        "abbreviation": team.get("abbreviation"),
+        "location": team.get("location"),
+        "shortDisplayName": team.get("shortDisplayName"),
+        "color": team.get("color"),
+        "alternateColor": team.get("alternateColor"),
+        "logos": team.get("logos"),
+        "record": {"items": record},
+        "franchise": {
+            "venue": {
+                "capacity": venue.get("capacity"),
+                "indoor": venue.get("indoor"),
+            }
+        },
+    }
+
+
+class TeamCache:
+    """Team metadata keyed by abbreviation, persisted across restarts."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_TEAMS)
+        self._teams = None
+        self._lock = asyncio.Lock()
+
+    async def _async_load(self) -> None:
+        """Load the stored teams on first use."""
+        async with self._lock:
+            if self._teams is None:
+                self._teams = await self._store.async_load() or {}
+                _LOGGER.debug("Loaded %s cached teams" % (len(self._teams)))
+
+    async def async_get(self, abbreviation: str, ttl: float):
+        """Return cached metadata for a team, or None if missing or older than ttl seconds."""
+        await self._async_load()
+        entry = self._teams.get(abbreviation)
+        if entry is None or time.time() - entry["fetched"] > ttl:
+            return None
+        return entry["team"]
+
+    async def async_set(self, abbreviation: str, team: dict) -> None:
+        """Cache metadata from a full team document, saving it if it changed."""
+        await self._async_load()
+        metadata = team_metadata(team)
+        entry = self._teams.get(abbreviation)
+        if entry is not None and entry["team"] == metadata:
+            entry["fetched"] = time.time()
+            return
+
+        self._teams[abbreviation] = {
+            "fetched": time.time(),
+            "revision": 1 if entry is None else entry.get("revision", 0) + 1,
+            "team": metadata,
+        }
+        self._store.async_delay_save(lambda: self._teams, STORAGE_SAVE_DELAY)
+
+    def revision(self, abbreviation: str):
+        """Return a number that changes whenever a team's cached metadata changes."""
+        if self._teams is None or abbreviation not in self._teams:
+            return None
+        return self._teams[abbreviation].get("revision", 0)
+
+
+class SnapshotStore:
+    """Last good snapshot of each team, persisted so entities start with data."""
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOTS)
+        self._snapshots = None
+        self._lock = asyncio.Lock()
+
+    async def async_get(self, team_id: str):
+        """Return the stored snapshot of a team, or None."""
+        async with self._lock:
+            if self._snapshots is None:
+                self._snapshots = await self._store.async_load() or {}
+                _LOGGER.debug("Loaded %s stored snapshots" % (len(self._snapshots)))
+        data = self._snapshots.get(team_id)
+        return None if data is None else GameSnapshot.from_dict(data)
+
+    def set(self, team_id: str, snapshot: GameSnapshot) -> None:
+        """Store a team's snapshot, saving soon after."""
+        if self._snapshots is None:
+            # Not loaded yet; saving now would drop the other teams
+            return
+        self._snapshots[team_id] = snapshot.as_dict()
+        self._store.async_delay_save(lambda: self._snapshots, STORAGE_SAVE_DELAY)
@@ -12,9 +12,19 @@ from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_CACHE_TTL,
+    CONF_CLUTCH_INTERVAL,
+    CONF_INTERMISSION_INTERVAL,
+    CONF_LIVE_INTERVAL,
+    CONF_REQUESTS_PER_MINUTE,
     CONF_TIMEOUT,
     CONF_TEAM_ID,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CLUTCH_INTERVAL,
+    DEFAULT_INTERMISSION_INTERVAL,
+    DEFAULT_LIVE_INTERVAL,
     DEFAULT_NAME,
+    DEFAULT_REQUESTS_PER_MINUTE,
     DEFAULT_TIMEOUT,
     DOMAIN,
     USER_AGENT,
@@ -32,15 +42,34 @@ def _get_schema(hass: Any, user_input: list, default_dict: list) -> Any:
     if user_input is None:
         user_input = {}
 
-    def _get_default(key):
+    def _get_default(key, fallback=None):
         """Gets default value for key."""
-        return user_input.get(key, default_dict.get(key))
+        return user_input.get(key, default_dict.get(key, fallback))
 
     return vol.Schema(
         {
             vol.Required(CONF_TEAM_ID, default=_get_default(CONF_TEAM_ID)): str,
             vol.Optional(CONF_NAME, default=_get_default(CONF_NAME)): str,
             vol.Optional(CONF_TIMEOUT, default=_get_default(CONF_TIMEOUT)): int,
+            vol.Optional(
+                CONF_CACHE_TTL, default=_get_default(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_LIVE_INTERVAL,
+                default=_get_default(CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_INTERMISSION_INTERVAL,
+                default=_get_default(CONF_INTERMISSION_INTERVAL, DEFAULT_INTERMISSION_INTERVAL),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_CLUTCH_INTERVAL,
+                default=_get_default(CONF_CLUTCH_INTERVAL, DEFAULT_CLUTCH_INTERVAL),
+            ): vol.All(int, vol.Range(min=1)),
+            vol.Optional(
+                CONF_REQUESTS_PER_MINUTE,
+                default=_get_default(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE),
+            ): vol.All(int, vol.Range(min=1)),
         }
     )
 
@@ -146,7 +175,7 @@ class NHLScoresOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, config_entry):
         """Initialize."""
         self.config = config_entry
-        self._data = dict(config_entry.options)
+        self._data = {**config_entry.data, **config_entry.options}
         self._errors = {}
 
     async def async_step_init(self, user_input=None):
@@ -6,11 +6,187 @@ USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 11_6) AppleWebKit/605.1.15
 # Config
 CONF_TIMEOUT = "timeout"
 CONF_TEAM_ID = "team_id"
+CONF_CACHE_TTL = "team_cache_ttl"
+CONF_LIVE_INTERVAL = "live_interval"
+CONF_INTERMISSION_INTERVAL = "intermission_interval"
+CONF_CLUTCH_INTERVAL = "clutch_interval"
+CONF_REQUESTS_PER_MINUTE = "requests_per_minute"
+CONF_SCOREBOARD_ENDPOINT = "scoreboard_endpoint"
+CONF_TEAM_ENDPOINT = "team_endpoint"
 
 # Defaults
 DEFAULT_ICON = "mdi:hockey"
 DEFAULT_NAME = "NHL"
 DEFAULT_TIMEOUT = 180
+DEFAULT_CACHE_TTL = 6
+DEFAULT_LIVE_INTERVAL = 5
+DEFAULT_INTERMISSION_INTERVAL = 60
+DEFAULT_CLUTCH_INTERVAL = 3
+DEFAULT_REQUESTS_PER_MINUTE = 60
+
+# Shared scoreboard
+SCOREBOARD_MAX_AGE = 2
+
+# Schedule index: days of games fetched ahead, and how long it is trusted (in seconds)
+SCHEDULE_DAYS = 14
+SCHEDULE_LIMIT = 1000
+SCHEDULE_MAX_AGE = 86400
+SCHEDULE_RETRY_INTERVAL = 900
+
+# Request budget shared by every entry
+RATE_LIMIT_BURST = 10
+PRIORITY_IDLE = 0
+PRIORITY_LIVE = 1
+
+# Failure handling (in seconds)
+BACKOFF_MAX_INTERVAL = 900
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_OPEN_TIME = 30
+BREAKER_MAX_OPEN_TIME = 900
+
+# Polling planner (in seconds)
+DEFAULT_INTERVAL = 1200
+PRE_GAME_WINDOW = 1200
+PRE_GAME_MAX_INTERVAL = 21600
+POST_GAME_INTERVAL = 3600
+OFF_SEASON_INTERVAL = 86400
+STALE_GAME_AGE = 21600
+STOPPAGE_INTERVAL = 15
+CLUTCH_TIME = 300
+CLUTCH_GOAL_DIFF = 1
+INTERMISSION_STATES = ("STATUS_END_PERIOD",)
+STOPPAGE_STATES = ("STATUS_DELAYED",)
+
+# Sensor attributes, in the order they are shown
+ATTRIBUTES = (
+    "detailed_state",
+    "game_length",
+    "date",
+    "game_end_time",
+    "attendance",
+    "event_name",
+    "event_short_name",
+    "event_type",
+    "game_notes",
+    "series_summary",
+    "venue_name",
+    "venue_city",
+    "venue_state",
+    "venue_capacity",
+    "venue_indoor",
+    "period",
+    "period_description",
+    "winning_goalie",
+    "winning_goalie_saves",
+    "winning_goalie_save_pct",
+    "losing_goalie",
+    "losing_goalie_saves",
+    "losing_goalie_save_pct",
+    "first_star",
+    "second_star",
+    "third_star",
+    "game_status",
+    "home_team_abbr",
+    "home_team_id",
+    "home_team_city",
+    "home_team_name",
+    "home_team_logo",
+    "home_team_goals",
+    "home_team_colors",
+    "home_team_ls_1",
+    "home_team_ls_2",
+    "home_team_ls_3",
+    "home_team_ls_ot",
+    "home_team_record",
+    "away_team_abbr",
+    "away_team_id",
+    "away_team_city",
+    "away_team_name",
+    "away_team_logo",
+    "away_team_goals",
+    "away_team_colors",
+    "away_team_ls_1",
+    "away_team_ls_2",
+    "away_team_ls_3",
+    "away_team_ls_ot",
+    "away_team_record",
+    "puck_drop_in",
+    "tv_network",
+    "last_play",
+    "home_team_starting_goalie",
+    "away_team_starting_goalie",
+    "odds",
+    "overunder",
+    "home_team_odds_win_pct",
+    "away_team_odds_win_pct",
+    "win_or_loss",
+    "headlines",
+    "last_update",
+    "next_poll",
+    "stale",
+)
+
+# Left out of the recorder: static or bulky attributes, and the time-derived
+# ones that would make every recorded attribute set unique
+UNRECORDED_ATTRIBUTES = frozenset(
+    {
+        "event_name",
+        "event_short_name",
+        "event_type",
+        "game_notes",
+        "venue_name",
+        "venue_city",
+        "venue_state",
+        "venue_capacity",
+        "venue_indoor",
+        "home_team_id",
+        "home_team_city",
+        "home_team_name",
+        "home_team_logo",
+        "home_team_colors",
+        "home_team_record",
+        "away_team_id",
+        "away_team_city",
+        "away_team_name",
+        "away_team_logo",
+        "away_team_colors",
+        "away_team_record",
+        "tv_network",
+        "odds",
+        "overunder",
+        "home_team_odds_win_pct",
+        "away_team_odds_win_pct",
+        "headlines",
+        "last_play",
+        "puck_drop_in",
+        "last_update",
+        "next_poll",
+    }
+)
+
+# Change detection
+VOLATILE_FIELDS = ("last_update", "next_poll", "puck_drop_in")
+VOLATILE_REFRESH_INTERVAL = 60
+
+# Seconds between local recomputations of the time-derived fields (no request is made)
+CLOCK_INTERVAL = 30
+
+# Team metadata cache
+STORAGE_VERSION = 1
+STORAGE_KEY_TEAMS = "nhl.teams"
+STORAGE_KEY_SNAPSHOTS = "nhl.snapshots"
+STORAGE_KEY_SCHEDULE = "nhl.schedule"
+STORAGE_SAVE_DELAY = 30
+
+# HTTP connection pool
+REQUEST_TIMEOUT = 20
+CONNECTION_LIMIT = 10
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+
+# Instrumentation
+UPDATE_HISTORY = 100
+UPDATE_HISTOGRAM_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
 
 # Misc
 TEAM_ID = ""
@@ -20,4 +196,5 @@ DOMAIN = "nhl"
 PLATFORM = "sensor"
 ATTRIBUTION = "Data provided by ESPN"
 COORDINATOR = "coordinator"
+HUB = "hub"
 PLATFORMS = ["sensor"]
@@ -0,0 +1,385 @@
+""" NHL data coordinator """
+import asyncio
+import logging
+import time
+from datetime import timedelta
+from types import MappingProxyType
+
+from homeassistant.const import ATTR_ATTRIBUTION, CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+import aiohttp
+
+from .api import ApiError
+from .breaker import CircuitOpenError
+from .dates import humanize, parse_date, timestamp
+from .fields import extract_schedule_event, extract_scoreboard_event, next_event_opponent
+from .hub import get_hub
+from .limiter import request_priority
+from .model import GameSnapshot
+from .planner import backoff_interval, plan_update_interval
+from .stats import UpdateStats, stage
+
+from .const import (
+    ATTRIBUTION,
+    CLOCK_INTERVAL,
+    CONF_CACHE_TTL,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_TEAM_ID,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    VOLATILE_FIELDS,
+    VOLATILE_REFRESH_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors that mean ESPN could not be reached or answered badly; the last
+# good data is kept, marked stale. Anything else is a bug and fails the update.
+FETCH_ERRORS = (ApiError, CircuitOpenError, aiohttp.ClientError, asyncio.TimeoutError, UpdateFailed)
+
+
+class AlertsDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching NHL data."""
+
+    def __init__(self, hass, config, the_timeout: int):
+        """Initialize."""
+        self.interval = timedelta(minutes=20)
+        self.name = config[CONF_NAME]
+        self.timeout = the_timeout
+        self.config = config
+        self.hass = hass
+        self.hub = get_hub(hass, config)
+        self.hub.track(config[CONF_TEAM_ID], config.get(CONF_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_PER_MINUTE))
+        self._published_at = None
+        self._failures = 0
+        self._planned_interval = self.interval
+        self.attributes = None
+        self.stats = UpdateStats()
+        self._unsub_clock = None
+
+        _LOGGER.debug("Data will be updated every %s", self.interval)
+
+        # Listeners are only notified when _async_update_data returns a new snapshot
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=self.name,
+            update_interval=self.interval,
+            always_update=False,
+        )
+
+    async def _async_update_data(self):
+        """Fetch data"""
+        started = time.perf_counter()
+        success = False
+        try:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    with self.stats.stage("state"):
+                        data = await update_game(self.hub, self.config, self.data, self.stats)
+                # plan the next poll from the game's state and start time
+                if not data:
+                    raise UpdateFailed("No data for %s" % self.config[CONF_TEAM_ID])
+                self._planned_interval = plan_update_interval(data, dt_util.utcnow(), self.config)
+                self.update_interval = self._planned_interval
+                data.next_poll = timestamp(dt_util.utcnow() + self.update_interval)
+                data.stale = False
+            except FETCH_ERRORS as error:
+                return self._stale_snapshot(error)
+            except Exception as error:
+                raise UpdateFailed(
+                    "Unexpected error updating %s: %s: %s"
+                    % (self.config[CONF_TEAM_ID], type(error).__name__, error)
+                ) from error
+            self._failures = 0
+            with self.stats.stage("publish"):
+                snapshot = self._select_snapshot(data)
+            success = True
+            return snapshot
+        finally:
+            self.stats.record_update(time.perf_counter() - started, success)
+
+    @property
+    def failures(self) -> int:
+        """Return how many updates in a row have failed."""
+        return self._failures
+
+    def _stale_snapshot(self, error) -> GameSnapshot:
+        """Back off after a failed update and keep showing the last good data, marked stale.
+
+        Raises UpdateFailed when there is no good data to fall back on.
+        """
+        self._failures += 1
+        if isinstance(error, CircuitOpenError):
+            # No request went out; come back when the breaker lets a probe through
+            self.update_interval = max(self._planned_interval, timedelta(seconds=error.retry_in))
+        else:
+            self.update_interval = backoff_interval(self._failures, self._planned_interval)
+        _LOGGER.debug(
+            "Update %s for %s failed: %s; retrying in %s"
+            % (self._failures, self.config[CONF_TEAM_ID], error, self.update_interval)
+        )
+        if not self.data:
+            raise UpdateFailed(error) from error
+        if self._failures == 1:
+            _LOGGER.warning(
+                "Could not update %s (%s); showing the last data, marked stale"
+                % (self.config[CONF_TEAM_ID], error)
+            )
+        if self.data.stale:
+            return self.data
+
+        data = self.data.copy()
+        data.stale = True
+        self._published_at = time.monotonic()
+        self.attributes = build_attributes(data)
+        return data
+
+    @callback
+    def async_add_listener(self, update_callback, context=None) -> CALLBACK_TYPE:
+        """Listen for data updates, running the clock while anyone listens."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        if self._unsub_clock is None:
+            self._unsub_clock = async_track_time_interval(
+                self.hass,
+                self._async_tick_clock,
+                timedelta(seconds=CLOCK_INTERVAL),
+                name="nhl clock %s" % self.config[CONF_TEAM_ID],
+                cancel_on_shutdown=True,
+            )
+
+        @callback
+        def remove_clock_listener() -> None:
+            remove_listener()
+            if not self._listeners:
+                self._stop_clock()
+
+        return remove_clock_listener
+
+    def _stop_clock(self) -> None:
+        if self._unsub_clock is not None:
+            self._unsub_clock()
+            self._unsub_clock = None
+
+    async def async_shutdown(self) -> None:
+        """Cancel the clock and any scheduled refresh."""
+        self._stop_clock()
+        await super().async_shutdown()
+
+    @callback
+    def _async_tick_clock(self, now) -> None:
+        """Republish the time-derived fields between updates, without fetching."""
+        if self.data is None:
+            return
+        data = refresh_clock(self.data, now)
+        if data is None:
+            return
+        self.stats.count("clock_refreshes")
+        self.data = data
+        self.attributes = build_attributes(data)
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timing the fan-out."""
+        with self.stats.stage("listeners"):
+            super().async_update_listeners()
+
+    def _select_snapshot(self, data: GameSnapshot) -> GameSnapshot:
+        """Return data, or keep the current snapshot if only volatile fields moved.
+
+        Volatile fields such as last_update still get published once every
+        VOLATILE_REFRESH_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        if (
+            self.data is not None
+            and self._published_at is not None
+            and now - self._published_at < VOLATILE_REFRESH_INTERVAL
+            and not has_changed(self.data, data)
+        ):
+            # Bookkeeping still has to follow the latest fetch
+            self.data.source = data.source
+            return self.data
+
+        if self.data is None or has_changed(self.data, data):
+            self.hub.snapshots.set(self.config[CONF_TEAM_ID], data)
+        self._published_at = now
+        self.attributes = build_attributes(data)
+        return data
+
+    async def async_restore(self) -> None:
+        """Publish the last snapshot stored before a restart, marked stale.
+
+        Entities then have something to show while the first update runs.
+        """
+        data = await self.hub.snapshots.async_get(self.config[CONF_TEAM_ID])
+        if data is None or self.data is not None:
+            return
+        _LOGGER.debug("Restored the last known state of %s" % (self.config[CONF_TEAM_ID]))
+        data.stale = True
+        self.attributes = build_attributes(data)
+        self.async_set_updated_data(data)
+
+
+async def update_game(hub, config, previous=None, stats=None) -> GameSnapshot:
+    """Fetch new state data for the sensor.
+    This is the only method that should fetch new data for Home Assistant.
+    """
+
+    data = await async_get_state(hub, config, previous, stats)
+    return data
+
+async def async_get_state(hub, config, previous=None, stats=None) -> GameSnapshot:
+    """Query API for status.
+
+    When every document the previous snapshot was built from is unchanged,
+    the previous snapshot is reused and only the time-derived fields are
+    refreshed. stats, if given, times the extraction and counts reuses.
+    Returns None if the scoreboard could not be fetched.
+    """
+
+    values = None
+    team_id = config[CONF_TEAM_ID]
+    priority = request_priority(previous)
+    _LOGGER.debug("Getting state for %s from the shared scoreboard" % (team_id))
+    events = await hub.async_get_events(team_id, priority)
+    scoreboard_revision = hub.client.revision(hub.scoreboard_url)
+
+    if events is not None and is_unchanged(previous, (scoreboard_revision,)):
+        _LOGGER.debug("Scoreboard unchanged for %s; reusing parsed data." % (team_id))
+        if stats is not None:
+            stats.count("reused")
+        return refresh_state(previous, team_id)
+
+    if events is not None:
+        event = events.get(team_id)
+        if event is not None:
+            _LOGGER.debug("Found team event for %s; parsing data." % (team_id))
+            with stage(stats, "extract"):
+                values = extract_scoreboard_event(event, team_id)
+            values.last_update = timestamp()
+            values.source = (scoreboard_revision,)
+
+        # Never found the team. Either off today or a post-season condition
+        else:
+            event = await hub.async_get_next_event(team_id, priority)
+            if event is not None:
+                _LOGGER.debug("Team not on today's scoreboard; using its next game from the schedule index.")
+                source = (scoreboard_revision, hub.schedule.revision, event.get("id"))
+                if is_unchanged(previous, source):
+                    if stats is not None:
+                        stats.count("reused")
+                    return refresh_state(previous, team_id)
+                with stage(stats, "extract"):
+                    values = extract_scoreboard_event(event, team_id)
+                values.last_update = timestamp()
+                values.source = source
+                return values
+
+            _LOGGER.info("Team not found on scoreboard feed.  Using team API.")
+
+            team_url = hub.team_url + team_id
+            _LOGGER.info(team_url)
+            cache_ttl = config.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL) * 3600
+
+            # Look up the opponent we expect from the last update while the team document downloads
+            expected_oppo_id = expected_opponent(previous, team_id)
+            if expected_oppo_id is None:
+                data = await hub.async_fetch(team_url, team_id, priority, key="team")
+                expected_oppo_data = None
+            else:
+                data, expected_oppo_data = await asyncio.gather(
+                    hub.async_fetch(team_url, team_id, priority, key="team"),
+                    hub.async_get_team(expected_oppo_id, cache_ttl, team_id, priority),
+                    return_exceptions=True,
+                )
+                if isinstance(data, Exception):
+                    raise data
+                if isinstance(expected_oppo_data, Exception):
+                    _LOGGER.debug("Prefetching %s failed: %s" % (expected_oppo_id, expected_oppo_data))
+                    expected_oppo_data = None
+            if data is None:
+                raise UpdateFailed("No team document for %s" % (team_id))
+            team_data = data["team"]
+            await hub.team_cache.async_set(team_id, team_data)
+
+            # Determine our opponents team id (abbreviation) so that we can lookup their information as well
+            _, oppo_id = next_event_opponent(team_data, team_id)
+            if oppo_id is None:
+                oppo_data = None
+            elif oppo_id == expected_oppo_id and expected_oppo_data is not None:
+                oppo_data = expected_oppo_data
+            else:
+                oppo_data = await hub.async_get_team(oppo_id, cache_ttl, team_id, priority)
+
+            source = (
+                scoreboard_revision,
+                hub.client.revision(team_url),
+                None if oppo_id is None else hub.team_cache.revision(oppo_id),
+            )
+            if is_unchanged(previous, source):
+                _LOGGER.debug("Team documents unchanged for %s; reusing parsed data." % (team_id))
+                if stats is not None:
+                    stats.count("reused")
+                return refresh_state(previous, team_id)
+
+            with stage(stats, "extract"):
+                values = extract_schedule_event(team_data, oppo_data, team_id)
+            values.last_update = timestamp()
+            values.source = source
+
+    return values
+
+def expected_opponent(previous, team_id):
+    """Return the opponent abbreviation from the previous snapshot, if any."""
+    if previous is None:
+        return None
+    for abbr in (previous.home.abbr, previous.away.abbr):
+        if abbr is not None and abbr != team_id:
+            return abbr
+    return None
+
+def build_attributes(snapshot) -> MappingProxyType:
+    """Shape a snapshot into the read-only attributes mapping the sensor exposes."""
+    attrs = {ATTR_ATTRIBUTION: ATTRIBUTION}
+    attrs.update(snapshot.as_attributes())
+    return MappingProxyType(attrs)
+
+def has_changed(previous, snapshot) -> bool:
+    """Return True if any field other than the volatile ones differs."""
+    return snapshot.differs_from(previous, VOLATILE_FIELDS)
+
+def is_unchanged(previous, source) -> bool:
+    """Return True if the previous snapshot was built from the same document revisions."""
+    return previous is not None and previous.source == source
+
+def puck_drop_in(snapshot, now=None):
+    """Describe how far the snapshot's game start is from now."""
+    start = parse_date(snapshot.date)
+    return None if start is None else humanize(start, now)
+
+def refresh_clock(snapshot, now=None):
+    """Return a copy with the time-derived fields recomputed, or None if none changed.
+
+    These only depend on the event date and the clock, so they can move
+    between updates: the countdown to puck drop, to the next game on an
+    off day, and the time since a game started once it is over.
+    """
+    value = puck_drop_in(snapshot, now)
+    if value == snapshot.puck_drop_in:
+        return None
+    snapshot = snapshot.copy()
+    snapshot.puck_drop_in = value
+    return snapshot
+
+def refresh_state(previous, team_id) -> GameSnapshot:
+    """Reuse the previous snapshot, recomputing only the fields that depend on the clock."""
+    snapshot = previous.copy()
+    snapshot.puck_drop_in = puck_drop_in(snapshot)
+    snapshot.last_update = timestamp()
+    return snapshot
@@ -0,0 +1,107 @@
+""" NHL date parsing and formatting """
+from datetime import datetime, timezone
+
+from homeassistant.util import dt as dt_util
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+SECONDS_PER_WEEK = 604800
+SECONDS_PER_MONTH = 2635200
+SECONDS_PER_YEAR = 31536000
+
+
+def parse_date(date):
+    """Parse an ESPN event date, or return None if there is none.
+
+    Dates without an offset are taken to be UTC.
+    """
+    if not isinstance(date, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(date.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def timestamp(when: datetime = None) -> str:
+    """Format a time (now by default) in the local time zone, eg. "2024-03-01 19:00:00-05:00"."""
+    if when is None:
+        when = dt_util.now()
+    else:
+        when = dt_util.as_local(when)
+    return when.isoformat(" ", "seconds")
+
+
+def _add_months(when: datetime, months: int) -> datetime:
+    """Move a time by whole months, clamping the day to the end of the month."""
+    month = when.month - 1 + months
+    year = when.year + month // 12
+    month = month % 12 + 1
+    for day in range(when.day, 27, -1):
+        try:
+            return when.replace(year=year, month=month, day=day)
+        except ValueError:
+            continue
+    return when.replace(year=year, month=month, day=min(when.day, 28))
+
+
+def _calendar_months(earlier: datetime, later: datetime) -> int:
+    """Return the whole calendar months between two times, rounding up past half a month."""
+    months = (later.year - earlier.year) * 12 + later.month - earlier.month
+    if _add_months(earlier, months) > later:
+        months -= 1
+    if (later - _add_months(earlier, months)).days > 14:
+        months += 1
+    return min(months, 12)
+
+
+def _relative(count: int, unit: str, future: bool) -> str:
+    if count == 1:
+        text = "an %s" % unit if unit == "hour" else "a %s" % unit
+    else:
+        text = "%s %ss" % (count, unit)
+    return "in %s" % text if future else "%s ago" % text
+
+
+def humanize(when: datetime, now: datetime = None) -> str:
+    """Describe how far a time is from now, eg. "in 30 minutes" or "2 days ago".
+
+    Follows the thresholds of arrow's humanize(), which earlier versions used.
+    """
+    if now is None:
+        now = dt_util.utcnow()
+    delta = int(round((when - now).total_seconds()))
+    future = delta > 0
+    diff = abs(delta)
+
+    if diff < 10:
+        return "just now"
+    if diff < SECONDS_PER_MINUTE:
+        return _relative(diff, "second", future)
+    if diff < SECONDS_PER_MINUTE * 2:
+        return _relative(1, "minute", future)
+    if diff < SECONDS_PER_HOUR:
+        return _relative(max(diff // SECONDS_PER_MINUTE, 2), "minute", future)
+    if diff < SECONDS_PER_HOUR * 2:
+        return _relative(1, "hour", future)
+    if diff < SECONDS_PER_DAY:
+        return _relative(max(diff // SECONDS_PER_HOUR, 2), "hour", future)
+    if diff < SECONDS_PER_DAY * 2:
+        return _relative(1, "day", future)
+    if diff < SECONDS_PER_WEEK:
+        return _relative(max(diff // SECONDS_PER_DAY, 2), "day", future)
+
+    months = _calendar_months(min(when, now), max(when, now))
+    if months >= 1 and diff < SECONDS_PER_YEAR:
+        return _relative(months, "month", future)
+    if diff < SECONDS_PER_WEEK * 2:
+        return _relative(1, "week", future)
+    if diff < SECONDS_PER_MONTH:
+        return _relative(max(diff // SECONDS_PER_WEEK, 2), "week", future)
+    if diff < SECONDS_PER_YEAR * 2:
+        return _relative(1, "year", future)
+    return _relative(max(diff // SECONDS_PER_YEAR, 2), "year", future)
@@ -0,0 +1,33 @@
+""" Diagnostics support for NHL """
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import COORDINATOR, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return timings, counters and the current data of an entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    hub = coordinator.hub
+    snapshot = coordinator.data
+
+    return {
+        "config": {**entry.data, **entry.options},
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "failures_in_a_row": coordinator.failures,
+            "stats": coordinator.stats.as_dict(),
+        },
+        # The hub and its client are shared by every NHL entry
+        "hub": {
+            "scoreboard_url": hub.scoreboard_url,
+            "team_url": hub.team_url,
+            "tracked_teams": hub.tracked_teams,
+            "stats": hub.client.stats.as_dict(),
+            "limiter": hub.limiter.as_dict(),
+            "breakers": {url: breaker.as_dict() for url, breaker in hub.breakers.items()},
+            "schedule": hub.schedule.as_dict(),
+        },
+        "data": None if snapshot is None else {"state": snapshot.state, **snapshot.as_attributes()},
+    }
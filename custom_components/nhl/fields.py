@@ -0,0 +1,343 @@
+""" NHL event field extraction """
+from .dates import humanize, parse_date
+from .model import GameSnapshot, attribute_path
+
+MISSING = object()
+
+# Where _extract writes: the snapshot, its home TeamLine or its away TeamLine
+_TARGETS = {None: 0, "home": 1, "away": 2}
+
+
+def _lower(value):
+    """Lower-case a state string."""
+    return value.lower() if isinstance(value, str) else value
+
+
+def _humanize(date):
+    """Describe how far away a date is, eg. "in 30 minutes"."""
+    start = parse_date(date)
+    if start is None:
+        return MISSING
+    return humanize(start)
+
+
+def _colors(team):
+    """Return a team's primary and secondary colors as hex strings."""
+    if not isinstance(team, dict):
+        return MISSING
+    color = team.get("color")
+    alternate = team.get("alternateColor")
+    if not isinstance(color, str) or not isinstance(alternate, str):
+        return MISSING
+    return ["#" + color, "#" + alternate]
+
+
+def _stat(name):
+    """Return a transform picking one statistic's displayValue out of a list."""
+
+    def transform(statistics):
+        if not isinstance(statistics, list):
+            return MISSING
+        for stat in statistics:
+            if isinstance(stat, dict) and stat.get("name") == name:
+                return stat.get("displayValue", MISSING)
+        return MISSING
+
+    return transform
+
+
+# Every attribute of the sensor, read either from a scoreboard event or from
+# the nextEvent of a team document. Paths start at a node resolved once per
+# event:
+#   event     the event itself
+#   comp      event.competitions[0]
+#   home      comp.competitors[0]
+#   away      comp.competitors[1]
+#   featured  comp.status.featuredAthletes keyed by name (final games only)
+#   home_doc  team document of the home team (nextEvent only)
+#   away_doc  team document of the away team (nextEvent only)
+# A path of None means the field is not available from that source.
+#
+# name, scoreboard path, nextEvent path, transform, default
+FIELDS = (
+    ("state", "event.status.type.state", "comp.status.type.state", _lower, None),
+    ("detailed_state", "event.status.type.name", "comp.status.type.name", None, None),
+    ("date", "event.date", "event.date", None, None),
+    ("attendance", "comp.attendance", None, None, None),
+    ("event_name", "event.name", "event.name", None, None),
+    ("event_short_name", "event.shortName", "event.shortName", None, None),
+    ("event_type", "comp.type.abbreviation", "comp.type.abbreviation", None, None),
+    ("game_notes", "comp.notes.0.headline", "comp.notes.0.headline", None, None),
+    ("series_summary", "comp.series.summary", "comp.series.summary", None, None),
+    ("venue_name", "comp.venue.fullName", "comp.venue.fullName", None, None),
+    ("venue_city", "comp.venue.address.city", "comp.venue.address.city", None, None),
+    ("venue_state", "comp.venue.address.state", "comp.venue.address.state", None, None),
+    ("venue_capacity", "comp.venue.capacity", "home_doc.franchise.venue.capacity", None, None),
+    ("venue_indoor", "comp.venue.indoor", "home_doc.franchise.venue.indoor", None, None),
+    ("period", "comp.status.period", None, None, None),
+    ("period_description", "comp.status.type.shortDetail", None, None, None),
+    ("clock", "comp.status.clock", None, None, None),
+    ("winning_goalie", "featured.winningGoalie.athlete.fullName", None, None, None),
+    ("winning_goalie_saves", "featured.winningGoalie.statistics", None, _stat("saves"), None),
+    ("winning_goalie_save_pct", "featured.winningGoalie.statistics", None, _stat("savePct"), None),
+    ("losing_goalie", "featured.losingGoalie.athlete.fullName", None, None, None),
+    ("losing_goalie_saves", "featured.losingGoalie.statistics", None, _stat("saves"), None),
+    ("losing_goalie_save_pct", "featured.losingGoalie.statistics", None, _stat("savePct"), None),
+    ("first_star", "featured.firstStar.athlete.fullName", None, None, None),
+    ("second_star", "featured.secondStar.athlete.fullName", None, None, None),
+    ("third_star", "featured.thirdStar.athlete.fullName", None, None, None),
+    ("game_status", "event.status.type.shortDetail", None, None, None),
+    ("home_team_abbr", "home.team.abbreviation", "home.team.abbreviation", None, None),
+    ("home_team_id", "home.team.id", "home.team.id", None, None),
+    ("home_team_city", "home.team.location", "home.team.location", None, None),
+    ("home_team_name", "home.team.name", "home.team.shortDisplayName", None, None),
+    ("home_team_logo", "home.team.logo", "home.team.logos.2.href", None, None),
+    ("home_team_goals", "home.score", None, None, None),
+    ("home_team_colors", "home.team", "home_doc", _colors, ["#013369", "#013369"]),
+    ("home_team_ls_1", "home.linescores.0.value", None, None, None),
+    ("home_team_ls_2", "home.linescores.1.value", None, None, None),
+    ("home_team_ls_3", "home.linescores.2.value", None, None, None),
+    ("home_team_ls_ot", "home.linescores.3.value", None, None, None),
+    ("home_team_record", "home.records.0.summary", "home_doc.record.items.0.summary", None, None),
+    ("away_team_abbr", "away.team.abbreviation", "away.team.abbreviation", None, None),
+    ("away_team_id", "away.team.id", "away.team.id", None, None),
+    ("away_team_city", "away.team.location", "away.team.location", None, None),
+    ("away_team_name", "away.team.name", "away.team.shortDisplayName", None, None),
+    ("away_team_logo", "away.team.logo", "away.team.logos.2.href", None, None),
+    ("away_team_goals", "away.score", None, None, None),
+    ("away_team_colors", "away.team", "away_doc", _colors, ["#D50A0A", "#D50A0A"]),
+    ("away_team_ls_1", "away.linescores.0.value", None, None, None),
+    ("away_team_ls_2", "away.linescores.1.value", None, None, None),
+    ("away_team_ls_3", "away.linescores.2.value", None, None, None),
+    ("away_team_ls_ot", "away.linescores.3.value", None, None, None),
+    ("away_team_record", "away.records.0.summary", "away_doc.record.items.0.summary", None, None),
+    ("puck_drop_in", "event.date", "event.date", _humanize, None),
+    ("tv_network", "comp.broadcasts.0.names", "comp.broadcasts.0.media.shortName", None, None),
+    ("last_play", "comp.situation.lastPlay.text", None, None, None),
+    ("home_team_starting_goalie", "home.probables.0.athlete.displayName", "home.probables.0.athlete.displayName", None, None),
+    ("away_team_starting_goalie", "away.probables.0.athlete.displayName", "away.probables.0.athlete.displayName", None, None),
+    ("odds", "comp.odds.0.details", None, None, None),
+    ("overunder", "comp.odds.0.overUnder", None, None, None),
+    ("home_team_odds_win_pct", "comp.odds.1.homeTeamOdds.winPercentage", None, None, None),
+    ("away_team_odds_win_pct", "comp.odds.1.awayTeamOdds.winPercentage", None, None, None),
+    ("headlines", "comp.headlines.0.shortLinkText", "comp.notes.0.headline", None, None),
+)
+
+
+def _compile(source):
+    """Compile one source column of FIELDS into defaults and a tree of paths.
+
+    Paths sharing a prefix share a branch of the tree, so every intermediate
+    node of an event is looked up once per extraction no matter how many
+    fields sit below it. Each branch is a tuple of
+    (key, fields read at this node, child branches), and each field is a
+    (target, attribute, transform) to store on the snapshot (target 0) or
+    its home (1) or away (2) TeamLine.
+    """
+    defaults = []
+    trees = {}
+    for row in FIELDS:
+        path, transform, default = row[source], row[3], row[4]
+        side, attribute = attribute_path(row[0])
+        name = (_TARGETS[side], attribute)
+        if default is not None:
+            defaults.append((*name, default))
+        if path is None:
+            continue
+        root, *parts = path.split(".")
+        branch = trees.setdefault(root, {})
+        node = None
+        for part in parts:
+            key = int(part) if part.isdigit() else part
+            node = branch.setdefault(key, ([], {}))
+            branch = node[1]
+        if node is None:
+            trees.setdefault(None, []).append((root, (*name, transform)))
+        else:
+            node[0].append((*name, transform))
+
+    def freeze(branch):
+        return tuple(
+            (key, tuple(leaves), freeze(children))
+            for key, (leaves, children) in branch.items()
+        )
+
+    root_fields = tuple(trees.pop(None, ()))
+    return tuple(defaults), root_fields, tuple((root, freeze(branch)) for root, branch in trees.items())
+
+
+_SCOREBOARD_FIELDS = _compile(1)
+_SCHEDULE_FIELDS = _compile(2)
+
+
+def _index(node, index):
+    """Return node[index] if node is a long enough list, else None."""
+    if type(node) is list and index < len(node):
+        return node[index]
+    return None
+
+
+def _get(node, key):
+    """Return node[key] if node is a dict, else None."""
+    return node.get(key) if type(node) is dict else None
+
+
+def _set(targets, leaves, node) -> None:
+    """Store the fields read directly from node."""
+    for target, attribute, transform in leaves:
+        if transform is None:
+            setattr(targets[target], attribute, node)
+        else:
+            value = transform(node)
+            if value is not MISSING:
+                setattr(targets[target], attribute, value)
+
+
+def _walk(node, branches, targets) -> None:
+    """Descend one level of the path tree below node."""
+    for key, leaves, children in branches:
+        if type(key) is int:
+            if type(node) is not list or key >= len(node):
+                continue
+            child = node[key]
+        else:
+            if type(node) is not dict or key not in node:
+                continue
+            child = node[key]
+        if leaves:
+            _set(targets, leaves, child)
+        if children:
+            _walk(child, children, targets)
+
+
+def _extract(fields, nodes) -> GameSnapshot:
+    """Read every field from the resolved nodes in a single pass."""
+    defaults, root_fields, trees = fields
+    snapshot = GameSnapshot()
+    targets = (snapshot, snapshot.home, snapshot.away)
+    for target, attribute, default in defaults:
+        setattr(targets[target], attribute, default)
+    for root, leaf in root_fields:
+        _set(targets, (leaf,), nodes[root])
+    for root, branches in trees:
+        _walk(nodes[root], branches, targets)
+    return snapshot
+
+
+def _featured(comp) -> dict:
+    """Key a final game's featured athletes (winningGoalie, firstStar, ...) by name."""
+    featured = {}
+    athletes = _get(_get(comp, "status"), "featuredAthletes")
+    if type(athletes) is list:
+        for athlete in athletes:
+            if type(athlete) is dict and athlete.get("name") not in featured:
+                featured[athlete.get("name")] = athlete
+    return featured
+
+
+def _win_or_loss(snapshot, team_id):
+    """Return "win", "loss" or "tie" for our team in a final game."""
+    try:
+        home_goals = int(snapshot.home.goals)
+        away_goals = int(snapshot.away.goals)
+    except (TypeError, ValueError):
+        return None
+
+    if home_goals == away_goals:
+        return "tie"
+    home_won = home_goals > away_goals
+    if snapshot.home.abbr == team_id:
+        return "win" if home_won else "loss"
+    return "loss" if home_won else "win"
+
+
+def index_events(scoreboard: dict, teams=None) -> dict:
+    """Map each competitor's abbreviation and team id to its scoreboard event.
+
+    When teams is given, only events involving one of those teams are kept.
+    """
+    index = {}
+    for event in _get(scoreboard, "events") or ():
+        comp = _index(_get(event, "competitions"), 0)
+        keys = []
+        for competitor in _get(comp, "competitors") or ():
+            team = _get(competitor, "team")
+            for key in (_get(team, "abbreviation"), _get(team, "id")):
+                if key is not None:
+                    keys.append(key)
+        if teams is not None and not any(key in teams for key in keys):
+            continue
+        for key in keys:
+            index.setdefault(key, event)
+    return index
+
+
+def index_schedule(scoreboard: dict, teams) -> dict:
+    """Map each of teams to its events on a date-ranged scoreboard.
+
+    Every team in teams gets an entry, even with no events.
+    """
+    schedule = {team: [] for team in teams}
+    for event in _get(scoreboard, "events") or ():
+        comp = _index(_get(event, "competitions"), 0)
+        for competitor in _get(comp, "competitors") or ():
+            abbr = _get(_get(competitor, "team"), "abbreviation")
+            if abbr in schedule:
+                schedule[abbr].append(event)
+    return schedule
+
+
+def extract_scoreboard_event(event: dict, team_id: str) -> GameSnapshot:
+    """Extract a snapshot of one event of the scoreboard."""
+    comp = _index(_get(event, "competitions"), 0)
+    competitors = _get(comp, "competitors")
+    state = _lower(_get(_get(_get(event, "status"), "type"), "state"))
+    nodes = {
+        "event": event,
+        "comp": comp,
+        "home": _index(competitors, 0),
+        "away": _index(competitors, 1),
+        "featured": _featured(comp) if state == "post" else {},
+    }
+
+    snapshot = _extract(_SCOREBOARD_FIELDS, nodes)
+    if snapshot.state == "post":
+        snapshot.win_or_loss = _win_or_loss(snapshot, team_id)
+    return snapshot
+
+
+def next_event_opponent(team_data: dict, team_id: str):
+    """Return (team_index, opponent abbreviation) for a team document's nextEvent.
+
+    The home team is always competitor 0. Both are None when there is no next event.
+    """
+    comp = _index(_get(_index(_get(team_data, "nextEvent"), 0), "competitions"), 0)
+    competitors = _get(comp, "competitors")
+    home = _get(_get(_index(competitors, 0), "team"), "abbreviation")
+    if home is None:
+        return None, None
+    team_index = 0 if home == team_id else 1
+    oppo = _index(competitors, 1 - team_index)
+    return team_index, _get(_get(oppo, "team"), "abbreviation")
+
+
+def extract_schedule_event(team_data: dict, oppo_data, team_id: str) -> GameSnapshot:
+    """Extract a snapshot of a team document's nextEvent.
+
+    Venue capacity, colors and records come from the team documents, so
+    oppo_data is the opponent's document (or None when unknown).
+    """
+    event = _index(_get(team_data, "nextEvent"), 0)
+    comp = _index(_get(event, "competitions"), 0)
+    competitors = _get(comp, "competitors")
+    team_index, _ = next_event_opponent(team_data, team_id)
+    nodes = {
+        "event": event,
+        "comp": comp,
+        "home": _index(competitors, 0),
+        "away": _index(competitors, 1),
+        "home_doc": team_data if team_index == 0 else oppo_data,
+        "away_doc": team_data if team_index == 1 else oppo_data,
+    }
+
+    return _extract(_SCHEDULE_FIELDS, nodes)
@@ -0,0 +1,277 @@
+""" Shared NHL scoreboard """
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+import aiohttp
+
+from .api import ApiError, NHLApiClient
+from .breaker import CircuitBreaker, CircuitOpenError
+from .cache import SnapshotStore, TeamCache
+from .fields import index_events, index_schedule
+from .limiter import RateLimiter
+from .schedule import ScheduleIndex
+from .const import (
+    API_SCOREBOARD_ENDPOINT,
+    API_TEAM_ENDPOINT,
+    CONF_SCOREBOARD_ENDPOINT,
+    CONF_TEAM_ENDPOINT,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DOMAIN,
+    HUB,
+    PRIORITY_IDLE,
+    SCHEDULE_DAYS,
+    SCHEDULE_LIMIT,
+    SCOREBOARD_MAX_AGE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_hub(hass: HomeAssistant, config=None):
+    """Return the scoreboard hub shared by every NHL coordinator.
+
+    The endpoints can be overridden from config, e.g. to point the
+    integration at a local stand-in for ESPN. The hub is shared, so the
+    first entry to set up decides them. The request budget is set as
+    teams are tracked, see ScoreboardHub.track.
+    """
+    config = config or {}
+    scoreboard_url = config.get(CONF_SCOREBOARD_ENDPOINT, API_SCOREBOARD_ENDPOINT)
+    team_url = config.get(CONF_TEAM_ENDPOINT, API_TEAM_ENDPOINT)
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if HUB not in domain_data:
+        domain_data[HUB] = ScoreboardHub(hass, scoreboard_url, team_url)
+    hub = domain_data[HUB]
+    if (hub.scoreboard_url, hub.team_url) != (scoreboard_url, team_url):
+        _LOGGER.warning(
+            "Ignoring endpoints %s and %s; the shared hub already uses %s and %s"
+            % (scoreboard_url, team_url, hub.scoreboard_url, hub.team_url)
+        )
+    return hub
+
+
+class ScoreboardHub:
+    """League-wide scoreboard, fetched once per tick for all teams."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        scoreboard_url: str = API_SCOREBOARD_ENDPOINT,
+        team_url: str = API_TEAM_ENDPOINT,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    ):
+        """Initialize."""
+        self.hass = hass
+        self.scoreboard_url = scoreboard_url
+        self.team_url = team_url
+        # Date-ranged scoreboard the schedule index is built from
+        self.schedule_url = scoreboard_url + "?dates="
+        self.client = NHLApiClient()
+        self.limiter = RateLimiter(requests_per_minute)
+        self.breakers = {
+            scoreboard_url: CircuitBreaker("The scoreboard endpoint"),
+            self.schedule_url: CircuitBreaker("The schedule endpoint"),
+            team_url: CircuitBreaker("The team endpoint"),
+        }
+        self.team_cache = TeamCache(hass)
+        self.snapshots = SnapshotStore(hass)
+        self.schedule = ScheduleIndex(hass)
+        self._events = None
+        self._tracked = Counter()
+        self._budgets = {}
+        self._priorities = {}
+        self._inflight = {}
+        self._fetched_at = None
+        self._lock = asyncio.Lock()
+        self._unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_on_close
+        )
+
+    async def async_fetch(self, url: str, team_id: str, priority: int = PRIORITY_IDLE, transform=None, key: str = None):
+        """Fetch url through the shared request budget, on behalf of team_id.
+
+        Concurrent calls for the same url share one request and its result
+        (or error). The request runs in its own task, so a caller that
+        times out does not cancel it for the others. transform and key are
+        passed on to NHLApiClient.async_get_json.
+        """
+        task = self._inflight.get(url)
+        if task is not None:
+            self.client.stats.count("coalesced")
+            return await asyncio.shield(task)
+
+        task = self.hass.async_create_task(self._async_fetch(url, team_id, priority, transform, key))
+        self._inflight[url] = task
+        task.add_done_callback(lambda done: self._fetch_done(url, done))
+        return await asyncio.shield(task)
+
+    def _fetch_done(self, url: str, task: asyncio.Task) -> None:
+        """Forget a finished request."""
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+        # Every caller may have given up; don't let the error go unretrieved
+        if not task.cancelled():
+            task.exception()
+
+    async def _async_fetch(self, url: str, team_id: str, priority: int, transform, key):
+        """Make one request, unless the endpoint's circuit breaker is open.
+
+        Raises CircuitOpenError without a request while it is.
+        """
+        if url == self.scoreboard_url:
+            breaker = self.breakers[self.scoreboard_url]
+        elif url.startswith(self.schedule_url):
+            breaker = self.breakers[self.schedule_url]
+        else:
+            breaker = self.breakers[self.team_url]
+        breaker.before_request()
+        try:
+            await self.limiter.acquire(team_id, priority)
+            data = await self.client.async_get_json(url, transform=transform, key=key)
+        except (ApiError, aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (e.g. by the update timeout) before an answer; let another probe go
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        return data
+
+    async def async_get_events(self, team_id: str = None, priority: int = PRIORITY_IDLE):
+        """Return today's scoreboard events keyed by team, fetching at most once per tick.
+
+        Coordinators for different teams refresh on the same cadence, so the
+        first one to ask within SCOREBOARD_MAX_AGE seconds fetches the
+        payload and the rest reuse it. Only the events of tracked teams are
+        indexed and kept; the rest of the payload is dropped right after
+        decoding. Returns None if the scoreboard could not be fetched.
+
+        The scoreboard serves every team, so it is requested at the
+        priority of the most urgent one.
+        """
+        if team_id is not None:
+            self._priorities[team_id] = priority
+        async with self._lock:
+            if (
+                self._fetched_at is not None
+                and time.monotonic() - self._fetched_at < SCOREBOARD_MAX_AGE
+            ):
+                self.client.stats.count("scoreboard_shared")
+                return self._events
+
+            _LOGGER.debug("Getting scoreboard from %s" % (self.scoreboard_url))
+            self._events = await self.async_fetch(
+                self.scoreboard_url,
+                team_id,
+                max((self._priorities.get(team, PRIORITY_IDLE) for team in self._tracked), default=priority),
+                transform=lambda data: index_events(data, self._tracked),
+            )
+            self._fetched_at = time.monotonic()
+            return self._events
+
+    async def async_get_next_event(self, team_id: str, priority: int = PRIORITY_IDLE):
+        """Return a team's next scoreboard event from the schedule index, or None.
+
+        The index covers SCHEDULE_DAYS days for every tracked team and is
+        refetched, in one request, once it is a day old or when a team it
+        does not cover asks. None means the team has no game in that range
+        or the index could not be fetched, and the team document should be
+        used instead.
+        """
+        await self.schedule.async_load()
+        if self.schedule.needs_refresh(team_id):
+            await self._async_refresh_schedule(team_id, priority)
+        return self.schedule.next_event(team_id)
+
+    async def _async_refresh_schedule(self, team_id: str, priority: int) -> None:
+        """Fetch the coming days' games of every tracked team into the schedule index."""
+        self.schedule.attempted()
+        teams = set(self._tracked) | {team_id}
+        first = dt_util.now().date()
+        last = first + timedelta(days=SCHEDULE_DAYS)
+        url = "%s%s-%s&limit=%s" % (self.schedule_url, first.strftime("%Y%m%d"), last.strftime("%Y%m%d"), SCHEDULE_LIMIT)
+        _LOGGER.debug("Getting the schedule of %s from %s" % (sorted(teams), url))
+        try:
+            events = await self.async_fetch(url, team_id, priority, transform=lambda data: index_schedule(data, teams))
+        except (ApiError, CircuitOpenError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+            _LOGGER.debug("Could not get the schedule: %s" % (error))
+            return
+        finally:
+            # Fetched once a day for whichever teams are tracked then; nothing to revalidate
+            self.client.invalidate(url)
+        if events is not None:
+            self.schedule.set(events)
+
+    def track(self, team_id: str, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE) -> None:
+        """Start keeping scoreboard events for a team.
+
+        requests_per_minute is the request budget the team's entry asks
+        for; the lowest one of the tracked teams applies.
+        """
+        self._tracked[team_id] += 1
+        self._budgets[team_id] = requests_per_minute
+        self._update_budget()
+        if self._tracked[team_id] == 1:
+            self._invalidate_scoreboard()
+
+    def untrack(self, team_id: str) -> None:
+        """Stop keeping scoreboard events for a team once no entry tracks it."""
+        self._tracked[team_id] -= 1
+        if self._tracked[team_id] <= 0:
+            del self._tracked[team_id]
+            self._priorities.pop(team_id, None)
+            self._budgets.pop(team_id, None)
+            self._update_budget()
+            self._invalidate_scoreboard()
+
+    @property
+    def tracked_teams(self) -> list:
+        """Return the abbreviations of the teams being tracked."""
+        return sorted(self._tracked)
+
+    def _update_budget(self) -> None:
+        """Apply the lowest request budget asked for by a tracked team."""
+        self.limiter.set_rate(min(self._budgets.values(), default=DEFAULT_REQUESTS_PER_MINUTE))
+
+    def _invalidate_scoreboard(self) -> None:
+        """Refetch the full scoreboard, as the kept events no longer match the tracked teams."""
+        self._fetched_at = None
+        self.client.invalidate(self.scoreboard_url)
+
+    async def async_get_team(self, abbreviation: str, ttl: float, team_id: str = None, priority: int = PRIORITY_IDLE):
+        """Return team metadata, going to the network only on a cache miss.
+
+        team_id is the tracked team the lookup is made for.
+        """
+        team = await self.team_cache.async_get(abbreviation, ttl)
+        if team is not None:
+            self.client.stats.count("team_cache_hits")
+            return team
+        self.client.stats.count("team_cache_misses")
+
+        data = await self.async_fetch(self.team_url + abbreviation, team_id or abbreviation, priority, key="team")
+        if data is None:
+            return None
+        await self.team_cache.async_set(abbreviation, data["team"])
+        return data["team"]
+
+    async def _async_on_close(self, event) -> None:
+        """Close the pooled session when Home Assistant shuts down."""
+        self._unsub_close = None
+        await self.client.async_close()
+
+    async def async_close(self) -> None:
+        """Release the hub once the last NHL entry is unloaded."""
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        self.limiter.cancel()
+        await self.client.async_close()
@@ -0,0 +1,136 @@
+""" Shared request budget for every NHL coordinator """
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+
+from .const import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    PRIORITY_IDLE,
+    PRIORITY_LIVE,
+    RATE_LIMIT_BURST,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def request_priority(snapshot) -> int:
+    """Return how urgently an entry's next requests should go out.
+
+    Entries whose game is in progress go ahead of those before or after one.
+    """
+    if snapshot is not None and snapshot.state == "in":
+        return PRIORITY_LIVE
+    return PRIORITY_IDLE
+
+
+class RateLimiter:
+    """Token bucket that hands out requests by priority, then round-robin by team.
+
+    Tokens refill at requests_per_minute / 60 per second, up to burst. A
+    request that finds the bucket empty waits in line; when a token comes
+    back it goes to the team whose oldest waiting request has the highest
+    priority and, among equals, to the team that was served longest ago.
+    """
+
+    def __init__(self, requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE, burst: int = RATE_LIMIT_BURST):
+        """Initialize."""
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._queues = {}
+        self._served_at = {}
+        self._timer = None
+        self.counters = Counter()
+        self._waited = 0.0
+
+    def set_rate(self, requests_per_minute: float) -> None:
+        """Change the budget, raising or lowering it."""
+        requests_per_minute = max(1, requests_per_minute)
+        if requests_per_minute == self.requests_per_minute:
+            return
+        # Tokens earned so far count at the old rate
+        self._refill()
+        self.requests_per_minute = requests_per_minute
+        _LOGGER.debug("Request budget set to %s per minute" % (requests_per_minute))
+        if self._timer is not None:
+            self.cancel()
+            self._schedule()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        rate = self.requests_per_minute / 60
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    async def acquire(self, team_id: str, priority: int = PRIORITY_IDLE) -> None:
+        """Wait until a request on behalf of team_id may go out."""
+        self._refill()
+        if not self._queues and self._tokens >= 1:
+            self._grant(team_id)
+            return
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(team_id, deque()).append((priority, future))
+        self.counters["queued"] += 1
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A token already handed to a cancelled waiter goes back in the bucket
+            if future.done() and not future.cancelled():
+                self._tokens += 1
+            raise
+        self._waited += time.monotonic() - started
+
+    def _grant(self, team_id: str) -> None:
+        self._tokens -= 1
+        self._served_at[team_id] = time.monotonic()
+        self.counters["granted"] += 1
+
+    def _schedule(self) -> None:
+        """Wake up the line when the next token is due."""
+        if self._timer is not None or not self._queues:
+            return
+        delay = max(0.0, (1 - self._tokens) * 60 / self.requests_per_minute)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand the tokens that came back to the waiters at the front of the line."""
+        self._timer = None
+        self._refill()
+        while self._queues and self._tokens >= 1:
+            team_id = max(
+                self._queues,
+                key=lambda team: (self._queues[team][0][0], -self._served_at.get(team, 0.0)),
+            )
+            queue = self._queues[team_id]
+            _, future = queue.popleft()
+            if not queue:
+                del self._queues[team_id]
+            if future.done():
+                continue
+            self._grant(team_id)
+            future.set_result(None)
+        self._schedule()
+
+    def cancel(self) -> None:
+        """Stop the pending wake-up, when the hub goes away."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def as_dict(self) -> dict:
+        """Return the budget and how it has been used, for diagnostics."""
+        queued = self.counters["queued"]
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "waiting": sum(len(queue) for queue in self._queues.values()),
+            "granted": self.counters["granted"],
+            "queued": queued,
+            "mean_wait_ms": round(self._waited / queued * 1000, 3) if queued else None,
+        }
@@ -0,0 +1,185 @@
+""" NHL game snapshot """
+from operator import attrgetter
+
+from .const import ATTRIBUTES
+
+TEAM_PREFIXES = (("home_team_", "home"), ("away_team_", "away"))
+
+
+def attribute_path(name: str):
+    """Return (side, field) holding a sensor attribute; side is None for game fields.
+
+    eg. "home_team_goals" -> ("home", "goals"), "period" -> (None, "period")
+    """
+    for prefix, side in TEAM_PREFIXES:
+        if name.startswith(prefix):
+            return side, name[len(prefix):]
+    return None, name
+
+
+class TeamLine:
+    """One team's side of a game."""
+
+    __slots__ = (
+        "abbr",
+        "id",
+        "city",
+        "name",
+        "logo",
+        "goals",
+        "colors",
+        "ls_1",
+        "ls_2",
+        "ls_3",
+        "ls_ot",
+        "record",
+        "starting_goalie",
+        "odds_win_pct",
+    )
+
+    def __init__(self):
+        """Initialize with every field unknown."""
+        for field in self.__slots__:
+            setattr(self, field, None)
+
+    def __eq__(self, other):
+        if type(other) is not TeamLine:
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    __hash__ = None
+
+    def as_dict(self) -> dict:
+        """Return the fields as a JSON-friendly dict."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Build a TeamLine from as_dict() output, ignoring unknown fields."""
+        line = cls()
+        for field in cls.__slots__:
+            if field in data:
+                setattr(line, field, data[field])
+        return line
+
+    def __repr__(self):
+        return "TeamLine(%s)" % (self.abbr,)
+
+
+class GameSnapshot:
+    """Everything the sensor shows about a game, as of one update.
+
+    Fields are named like the sensor attributes; the home_team_* and
+    away_team_* ones live on the home and away TeamLine. Snapshots are
+    replaced rather than changed once published, and copies share their
+    TeamLines, so those are never changed after extraction.
+    """
+
+    __slots__ = (
+        "state",
+        "detailed_state",
+        "game_length",
+        "date",
+        "game_end_time",
+        "attendance",
+        "event_name",
+        "event_short_name",
+        "event_type",
+        "game_notes",
+        "series_summary",
+        "venue_name",
+        "venue_city",
+        "venue_state",
+        "venue_capacity",
+        "venue_indoor",
+        "period",
+        "period_description",
+        "clock",
+        "winning_goalie",
+        "winning_goalie_saves",
+        "winning_goalie_save_pct",
+        "losing_goalie",
+        "losing_goalie_saves",
+        "losing_goalie_save_pct",
+        "first_star",
+        "second_star",
+        "third_star",
+        "game_status",
+        "puck_drop_in",
+        "tv_network",
+        "last_play",
+        "odds",
+        "overunder",
+        "win_or_loss",
+        "headlines",
+        "last_update",
+        "next_poll",
+        "stale",
+        "home",
+        "away",
+        # Revisions of the documents the snapshot was built from
+        "source",
+    )
+
+    def __init__(self):
+        """Initialize with every field unknown."""
+        for field in self.__slots__:
+            setattr(self, field, None)
+        self.home = TeamLine()
+        self.away = TeamLine()
+
+    def copy(self):
+        """Return a shallow copy, sharing the TeamLines."""
+        copy = GameSnapshot.__new__(GameSnapshot)
+        for field in self.__slots__:
+            setattr(copy, field, getattr(self, field))
+        return copy
+
+    def differs_from(self, other, ignore=()) -> bool:
+        """Return True if any field other than source and those in ignore differs."""
+        for field in self.__slots__:
+            if field == "source" or field in ignore:
+                continue
+            if getattr(self, field) != getattr(other, field):
+                return True
+        return False
+
+    def as_dict(self) -> dict:
+        """Return the snapshot as a JSON-friendly dict, for storage.
+
+        source is left out: revisions only mean something within one run.
+        """
+        data = {
+            field: getattr(self, field)
+            for field in self.__slots__
+            if field not in ("home", "away", "source")
+        }
+        data["home"] = self.home.as_dict()
+        data["away"] = self.away.as_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Build a snapshot from as_dict() output, ignoring unknown fields."""
+        snapshot = cls()
+        for field in cls.__slots__:
+            if field in ("home", "away", "source"):
+                continue
+            if field in data:
+                setattr(snapshot, field, data[field])
+        snapshot.home = TeamLine.from_dict(data.get("home") or {})
+        snapshot.away = TeamLine.from_dict(data.get("away") or {})
+        return snapshot
+
+    def as_attributes(self) -> dict:
+        """Return the sensor attributes, in display order."""
+        return dict(zip(ATTRIBUTES, _ATTRIBUTE_GETTER(self)))
+
+    def __repr__(self):
+        return "GameSnapshot(%s %s @ %s)" % (self.state, self.away.abbr, self.home.abbr)
+
+
+# Reads every attribute in one call, eg. "home.goals" for home_team_goals
+_ATTRIBUTE_GETTER = attrgetter(
+    *(field if side is None else "%s.%s" % (side, field) for side, field in map(attribute_path, ATTRIBUTES))
+)
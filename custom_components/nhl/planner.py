@@ -0,0 +1,120 @@
+""" NHL polling planner """
+import logging
+import random
+import re
+from datetime import datetime, timedelta
+
+from .dates import parse_date
+from .const import (
+    BACKOFF_MAX_INTERVAL,
+    CLUTCH_GOAL_DIFF,
+    CLUTCH_TIME,
+    CONF_CLUTCH_INTERVAL,
+    CONF_INTERMISSION_INTERVAL,
+    CONF_LIVE_INTERVAL,
+    DEFAULT_CLUTCH_INTERVAL,
+    DEFAULT_INTERMISSION_INTERVAL,
+    DEFAULT_INTERVAL,
+    DEFAULT_LIVE_INTERVAL,
+    INTERMISSION_STATES,
+    OFF_SEASON_INTERVAL,
+    POST_GAME_INTERVAL,
+    PRE_GAME_MAX_INTERVAL,
+    PRE_GAME_WINDOW,
+    STALE_GAME_AGE,
+    STOPPAGE_INTERVAL,
+    STOPPAGE_STATES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOCK = re.compile(r"^(\d+):(\d{2})")
+
+
+def clock_seconds(snapshot):
+    """Return the seconds left in the period, or None if unknown."""
+    clock = snapshot.clock
+    if isinstance(clock, (int, float)):
+        return clock
+    match = CLOCK.match(snapshot.period_description or "")
+    if match is None:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+
+def is_close(snapshot) -> bool:
+    """Return True if the score is within CLUTCH_GOAL_DIFF goals."""
+    try:
+        diff = int(snapshot.home.goals) - int(snapshot.away.goals)
+    except (TypeError, ValueError):
+        return False
+    return abs(diff) <= CLUTCH_GOAL_DIFF
+
+
+def live_interval(snapshot, config) -> float:
+    """Return the polling interval for a game in progress.
+
+    Intermissions and stoppages slow down; the end of a close 3rd period
+    and overtime speed up.
+    """
+    detailed_state = snapshot.detailed_state
+    description = snapshot.period_description or ""
+    period = snapshot.period
+
+    if detailed_state in INTERMISSION_STATES or description.startswith("End of") or "Intermission" in description:
+        return config.get(CONF_INTERMISSION_INTERVAL, DEFAULT_INTERMISSION_INTERVAL)
+    if detailed_state in STOPPAGE_STATES or "Delay" in description or "Review" in description:
+        return STOPPAGE_INTERVAL
+    if isinstance(period, int) and is_close(snapshot):
+        clock = clock_seconds(snapshot)
+        if period > 3 or (period == 3 and clock is not None and clock <= CLUTCH_TIME):
+            return config.get(CONF_CLUTCH_INTERVAL, DEFAULT_CLUTCH_INTERVAL)
+    return config.get(CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL)
+
+
+def plan_update_interval(snapshot, now: datetime, config=None) -> timedelta:
+    """Return how long to wait before the next useful poll.
+
+    - pre: sleep until PRE_GAME_WINDOW before puck drop (capped at
+      PRE_GAME_MAX_INTERVAL), then poll at the live rate
+    - in: poll at the live rate from live_interval
+    - post: back off to POST_GAME_INTERVAL until the next game shows up
+    - no game found: check once a day
+    """
+    if config is None:
+        config = {}
+    state = snapshot.state
+    start = parse_date(snapshot.date)
+
+    if state == "in":
+        seconds = live_interval(snapshot, config)
+    elif state == "pre" and start is not None:
+        until_window = (start - now).total_seconds() - PRE_GAME_WINDOW
+        live = config.get(CONF_LIVE_INTERVAL, DEFAULT_LIVE_INTERVAL)
+        if (now - start).total_seconds() > STALE_GAME_AGE:
+            # Still "pre" long after puck drop: postponed or not updated yet
+            seconds = DEFAULT_INTERVAL
+        else:
+            seconds = min(max(until_window, live), PRE_GAME_MAX_INTERVAL)
+    elif state == "post":
+        seconds = POST_GAME_INTERVAL
+    elif start is None:
+        seconds = OFF_SEASON_INTERVAL
+    else:
+        seconds = DEFAULT_INTERVAL
+
+    _LOGGER.debug("Event state %s starting %s; next poll in %s seconds" % (state, start, seconds))
+    return timedelta(seconds=seconds)
+
+
+def backoff_interval(failures: int, base: timedelta) -> timedelta:
+    """Return how long to wait after failures failed updates in a row.
+
+    The wait doubles from base with each failure, up to
+    BACKOFF_MAX_INTERVAL (or base, if that is longer), and is randomized
+    between half and all of that so entries drift apart.
+    """
+    base = base.total_seconds()
+    # The cap is reached long before 2 ** 16; a bigger exponent would overflow a float
+    seconds = min(max(BACKOFF_MAX_INTERVAL, base), base * 2 ** min(failures, 16))
+    return timedelta(seconds=random.uniform(seconds / 2, seconds))
@@ -0,0 +1,108 @@
+""" Local index of upcoming NHL games """
+import asyncio
+import logging
+import time
+from bisect import bisect_right
+from operator import itemgetter
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .dates import parse_date
+from .const import (
+    SCHEDULE_MAX_AGE,
+    SCHEDULE_RETRY_INTERVAL,
+    STORAGE_KEY_SCHEDULE,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ScheduleIndex:
+    """Upcoming scoreboard events of the tracked teams, persisted across restarts.
+
+    Each team's events are kept sorted by start time next to a list of
+    the start timestamps, so the next game is a binary search away.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initialize."""
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY_SCHEDULE)
+        self._events = None
+        self._starts = {}
+        self._fetched = 0.0
+        self._attempted = None
+        self.revision = 0
+        self._lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the stored index on first use."""
+        async with self._lock:
+            if self._events is None:
+                stored = await self._store.async_load() or {}
+                self._index(stored.get("events", {}))
+                self._fetched = stored.get("fetched", 0.0)
+                _LOGGER.debug("Loaded the stored schedule of %s teams" % (len(self._events)))
+
+    def _index(self, events: dict) -> None:
+        self._events = {}
+        self._starts = {}
+        for team, team_events in events.items():
+            dated = []
+            for event in team_events:
+                start = parse_date(event.get("date"))
+                if start is not None:
+                    dated.append((start.timestamp(), event))
+            dated.sort(key=itemgetter(0))
+            self._starts[team] = [start for start, _ in dated]
+            self._events[team] = [event for _, event in dated]
+
+    def needs_refresh(self, team_id: str) -> bool:
+        """Return True if the index is too old or does not cover team_id, and may be refetched now.
+
+        After a failed refetch the old index is used (or the caller falls
+        back) for SCHEDULE_RETRY_INTERVAL seconds before trying again.
+        """
+        if self._events is not None and team_id in self._events and time.time() - self._fetched < SCHEDULE_MAX_AGE:
+            return False
+        return self._attempted is None or time.monotonic() - self._attempted >= SCHEDULE_RETRY_INTERVAL
+
+    def attempted(self) -> None:
+        """Note that a refetch was tried."""
+        self._attempted = time.monotonic()
+
+    def set(self, events: dict) -> None:
+        """Replace the index with freshly fetched events keyed by team, saving it soon after."""
+        self._index(events)
+        self._fetched = time.time()
+        self._attempted = None
+        self.revision += 1
+        self._store.async_delay_save(
+            lambda: {"fetched": self._fetched, "events": self._events}, STORAGE_SAVE_DELAY
+        )
+
+    def next_event(self, team_id: str, now: float = None):
+        """Return the team's first event that has not started yet, or None.
+
+        Only a fresh index answers; None then means the team has no game in
+        the fetched range.
+        """
+        if self._events is None or time.time() - self._fetched >= SCHEDULE_MAX_AGE:
+            return None
+        starts = self._starts.get(team_id)
+        if not starts:
+            return None
+        if now is None:
+            now = time.time()
+        index = bisect_right(starts, now)
+        return self._events[team_id][index] if index < len(starts) else None
+
+    def as_dict(self) -> dict:
+        """Return the index's age and size, for diagnostics."""
+        return {
+            "age": None if not self._fetched else round(time.time() - self._fetched),
+            "revision": self.revision,
+            "events": {team: len(events) for team, events in (self._events or {}).items()},
+        }
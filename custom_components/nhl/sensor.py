@@ -2,24 +2,41 @@ import logging
 import uuid
 
 import voluptuous as vol
-from homeassistant.components.sensor import PLATFORM_SCHEMA
+from homeassistant.components.sensor import (
+    PLATFORM_SCHEMA,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
-from homeassistant.const import ATTR_ATTRIBUTION, CONF_NAME
+from homeassistant.const import CONF_NAME, EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import slugify
-from . import AlertsDataUpdateCoordinator
+from .coordinator import AlertsDataUpdateCoordinator
 
 from .const import (
-    ATTRIBUTION,
+    CONF_CACHE_TTL,
+    CONF_CLUTCH_INTERVAL,
+    CONF_INTERMISSION_INTERVAL,
+    CONF_LIVE_INTERVAL,
+    CONF_REQUESTS_PER_MINUTE,
+    CONF_SCOREBOARD_ENDPOINT,
+    CONF_TEAM_ENDPOINT,
     CONF_TIMEOUT,
     CONF_TEAM_ID,
     COORDINATOR,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CLUTCH_INTERVAL,
+    DEFAULT_INTERMISSION_INTERVAL,
+    DEFAULT_LIVE_INTERVAL,
     DEFAULT_ICON,
     DEFAULT_NAME,
+    DEFAULT_REQUESTS_PER_MINUTE,
     DEFAULT_TIMEOUT,
     DOMAIN,
+    UNRECORDED_ATTRIBUTES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,6 +46,13 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Required(CONF_TEAM_ID): cv.string,
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
         vol.Optional(CONF_TIMEOUT, default=DEFAULT_TIMEOUT): int,
+        vol.Optional(CONF_CACHE_TTL, default=DEFAULT_CACHE_TTL): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_LIVE_INTERVAL, default=DEFAULT_LIVE_INTERVAL): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_INTERMISSION_INTERVAL, default=DEFAULT_INTERMISSION_INTERVAL): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_CLUTCH_INTERVAL, default=DEFAULT_CLUTCH_INTERVAL): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_REQUESTS_PER_MINUTE, default=DEFAULT_REQUESTS_PER_MINUTE): vol.All(int, vol.Range(min=1)),
+        vol.Optional(CONF_SCOREBOARD_ENDPOINT): cv.url,
+        vol.Optional(CONF_TEAM_ENDPOINT): cv.url,
     }
 )
 
@@ -50,94 +74,77 @@ async def async_setup_platform(hass, config, async_add_entities, discovery_info=
         config[CONF_TIMEOUT],
     )
 
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_refresh()
+    # Start from the last known snapshot; the first fetch runs in the background
+    await coordinator.async_restore()
+    hass.async_create_background_task(
+        coordinator.async_refresh(), "nhl first refresh %s" % config[CONF_TEAM_ID]
+    )
 
     hass.data[DOMAIN][config.entry_id] = {
         COORDINATOR: coordinator,
     }
-    async_add_entities([NHLScoresSensor(hass, config)], True)
+    async_add_entities_for(hass, config, async_add_entities)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Setup the sensor platform."""
-    async_add_entities([NHLScoresSensor(hass, entry)], True)
+    async_add_entities_for(hass, entry, async_add_entities)
+
+
+def async_add_entities_for(hass, entry, async_add_entities):
+    """Add an entry's entities.
+
+    The scores sensor is not updated before being added: that would wait
+    for the first refresh, which runs in the background instead.
+    """
+    async_add_entities(
+        [NHLScoresSensor(hass, entry)]
+        + [NHLGameDetailSensor(hass, entry, *companion) for companion in COMPANION_SENSORS]
+    )
+    async_add_entities([NHLUpdateStatsSensor(hass, entry)], True)
+
+
+def game_score(data):
+    """Return the score, eg. "NYI 2 - 3 NYR", once the game has started."""
+    if data.state not in ("in", "post"):
+        return None
+    return "%s %s - %s %s" % (data.away.abbr, data.away.goals, data.home.goals, data.home.abbr)
+
+
+def game_period(data):
+    """Return the period and clock, eg. "13:33 - 3rd", once the game has started."""
+    if data.state not in ("in", "post"):
+        return None
+    return data.period_description
+
+
+def last_play(data):
+    """Return the last play, cut to the longest state Home Assistant allows."""
+    if not data.last_play:
+        return None
+    return data.last_play[:255]
+
+
+# key, name suffix, icon, value
+COMPANION_SENSORS = (
+    ("score", "score", "mdi:scoreboard-outline", game_score),
+    ("period", "period", "mdi:timer-outline", game_period),
+    ("last_play", "last play", "mdi:message-text-outline", last_play),
+)
 
 
 class NHLScoresSensor(CoordinatorEntity):
     """Representation of a Sensor."""
 
+    # Only game data that changes is kept in history
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the sensor."""
         super().__init__(hass.data[DOMAIN][entry.entry_id][COORDINATOR])
         self._config = entry
         self._name = entry.data[CONF_NAME]
         self._icon = DEFAULT_ICON
-        self._state = "PRE"
-        self._detailed_state = None
-        self._game_length = None
-        self._date = None
-        self._game_end_time = None
-        self._attendance = None
-        self._event_name = None
-        self._event_short_name = None
-        self._event_type = None
-        self._game_notes = None
-        self._series_summary = None
-        self._venue_name = None
-        self._venue_city = None
-        self._venue_state = None
-        self._venue_capacity = None
-        self._venue_indoor = None
-        self._period = None
-        self._period_description = None
-        self._winning_goalie = None
-        self._winning_goalie_saves = None
-        self._winning_goalie_save_pct = None
-        self._losing_goalie = None
-        self._losing_goalie_saves = None
-        self._losing_goalie_save_pct = None
-        self._first_star = None
-        self._second_star = None
-        self._third_star = None
-        self._game_status = None
-        self._home_team_abbr = None
-        self._home_team_id = None
-        self._home_team_city = None
-        self._home_team_name = None
-        self._home_team_logo = None
-        self._home_team_goals = None
-        self._home_team_colors = None
-        self._home_team_ls_1 = None
-        self._home_team_ls_2 = None
-        self._home_team_ls_3 = None
-        self._home_team_ls_ot = None
-        self._home_team_record = None
-        self._away_team_abbr = None
-        self._away_team_id = None
-        self._away_team_city = None
-        self._away_team_name = None
-        self._away_team_logo = None
-        self._away_team_goals = None
-        self._away_team_colors = None
-        self._away_team_ls_1 = None
-        self._away_team_ls_2 = None
-        self._away_team_ls_3 = None
-        self._away_team_ls_ot = None
-        self._away_team_record = None
-        self._puck_drop_in = None
-        self._tv_network = None
-        self._last_play = None
-        self._home_team_starting_goalie = None
-        self._away_team_starting_goalie = None
-        self._odds = None
-        self._overunder = None
-        self._home_team_odds_win_pct = None
-        self._away_team_odds_win_pct = None
-        self._win_or_loss = None
-        self._headlines = None
-        self._last_update = None
-        self._team_id = entry.data[CONF_TEAM_ID]
         self.coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
 
     @property
@@ -162,87 +169,81 @@ class NHLScoresSensor(CoordinatorEntity):
         """Return the state of the sensor."""
         if self.coordinator.data is None:
             return None
-        elif "state" in self.coordinator.data.keys():
-            return self.coordinator.data["state"]
-        else:
-            return None
+        return self.coordinator.data.state
 
     @property
     def extra_state_attributes(self):
         """Return the state message."""
-        attrs = {}
-
-        if self.coordinator.data is None:
-            return attrs
-
-        attrs[ATTR_ATTRIBUTION] = ATTRIBUTION
-        attrs["detailed_state"] = self.coordinator.data["detailed_state"]
-        attrs["game_length"] = self.coordinator.data["game_length"]
-        attrs["date"] = self.coordinator.data["date"]
-        attrs["game_end_time"] = self.coordinator.data["game_end_time"]
-        attrs["attendance"] = self.coordinator.data["attendance"]
-        attrs["event_name"] = self.coordinator.data["event_name"]
-        attrs["event_short_name"] = self.coordinator.data["event_short_name"]
-        attrs["event_type"] = self.coordinator.data["event_type"]
-        attrs["game_notes"] = self.coordinator.data["game_notes"]
-        attrs["series_summary"] = self.coordinator.data["series_summary"]
-        attrs["venue_name"] = self.coordinator.data["venue_name"]
-        attrs["venue_city"] = self.coordinator.data["venue_city"]
-        attrs["venue_state"] = self.coordinator.data["venue_state"]
-        attrs["venue_capacity"] = self.coordinator.data["venue_capacity"]
-        attrs["venue_indoor"] = self.coordinator.data["venue_indoor"]
-        attrs["period"] = self.coordinator.data["period"]
-        attrs["period_description"] = self.coordinator.data["period_description"]
-        attrs["winning_goalie"] = self.coordinator.data["winning_goalie"]
-        attrs["winning_goalie_saves"] = self.coordinator.data["winning_goalie_saves"]
-        attrs["winning_goalie_save_pct"] = self.coordinator.data["winning_goalie_save_pct"]
-        attrs["losing_goalie"] = self.coordinator.data["losing_goalie"]
-        attrs["losing_goalie_saves"] = self.coordinator.data["losing_goalie_saves"]
-        attrs["losing_goalie_save_pct"] = self.coordinator.data["losing_goalie_save_pct"]
-        attrs["first_star"] = self.coordinator.data["first_star"]
-        attrs["second_star"] = self.coordinator.data["second_star"]
-        attrs["third_star"] = self.coordinator.data["third_star"]
-        attrs["game_status"] = self.coordinator.data["game_status"]
-        attrs["home_team_abbr"] = self.coordinator.data["home_team_abbr"]
-        attrs["home_team_id"] = self.coordinator.data["home_team_id"]
-        attrs["home_team_city"] = self.coordinator.data["home_team_city"]
-        attrs["home_team_name"] = self.coordinator.data["home_team_name"]
-        attrs["home_team_logo"] = self.coordinator.data["home_team_logo"]
-        attrs["home_team_goals"] = self.coordinator.data["home_team_goals"]
-        attrs["home_team_colors"] = self.coordinator.data["home_team_colors"]
-        attrs["home_team_ls_1"] = self.coordinator.data["home_team_ls_1"]
-        attrs["home_team_ls_2"] = self.coordinator.data["home_team_ls_2"]
-        attrs["home_team_ls_3"] = self.coordinator.data["home_team_ls_3"]
-        attrs["home_team_ls_ot"] = self.coordinator.data["home_team_ls_ot"]
-        attrs["home_team_record"] = self.coordinator.data["home_team_record"]
-        attrs["away_team_abbr"] = self.coordinator.data["away_team_abbr"]
-        attrs["away_team_id"] = self.coordinator.data["away_team_id"]
-        attrs["away_team_city"] = self.coordinator.data["away_team_city"]
-        attrs["away_team_name"] = self.coordinator.data["away_team_name"]
-        attrs["away_team_logo"] = self.coordinator.data["away_team_logo"]
-        attrs["away_team_goals"] = self.coordinator.data["away_team_goals"]
-        attrs["away_team_colors"] = self.coordinator.data["away_team_colors"]
-        attrs["away_team_ls_1"] = self.coordinator.data["away_team_ls_1"]
-        attrs["away_team_ls_2"] = self.coordinator.data["away_team_ls_2"]
-        attrs["away_team_ls_3"] = self.coordinator.data["away_team_ls_3"]
-        attrs["away_team_ls_ot"] = self.coordinator.data["away_team_ls_ot"]
-        attrs["away_team_record"] = self.coordinator.data["away_team_record"]
-        attrs["puck_drop_in"] = self.coordinator.data["puck_drop_in"]
-        attrs["tv_network"] = self.coordinator.data["tv_network"]
-        attrs["last_play"] = self.coordinator.data["last_play"]
-        attrs["home_team_starting_goalie"] = self.coordinator.data["home_team_starting_goalie"]
-        attrs["away_team_starting_goalie"] = self.coordinator.data["away_team_starting_goalie"]
-        attrs["odds"] = self.coordinator.data["odds"]
-        attrs["overunder"] = self.coordinator.data["overunder"]
-        attrs["home_team_odds_win_pct"] = self.coordinator.data["home_team_odds_win_pct"]
-        attrs["away_team_odds_win_pct"] = self.coordinator.data["away_team_odds_win_pct"]
-        attrs["win_or_loss"] = self.coordinator.data["win_or_loss"]
-        attrs["headlines"] = self.coordinator.data["headlines"]
-        attrs["last_update"] = self.coordinator.data["last_update"]
-      
-        return attrs
+        if self.coordinator.attributes is None:
+            return {}
+        return self.coordinator.attributes
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
         return self.coordinator.last_update_success
+
+
+class NHLGameDetailSensor(CoordinatorEntity, SensorEntity):
+    """One fast-changing detail of the game (score, period, last play) as its own entity.
+
+    Disabled by default. Its history is a short state per change rather
+    than the scores sensor's whole attribute set.
+    """
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, key: str, label: str, icon: str, value) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass.data[DOMAIN][entry.entry_id][COORDINATOR])
+        name = entry.data[CONF_NAME]
+        self._attr_name = f"{name} {label}"
+        self._attr_unique_id = f"{slugify(name)}_{entry.entry_id}_{key}"
+        self._attr_icon = icon
+        self._value = value
+
+    @property
+    def native_value(self):
+        """Return the detail from the latest snapshot."""
+        if self.coordinator.data is None:
+            return None
+        return self._value(self.coordinator.data)
+
+
+class NHLUpdateStatsSensor(SensorEntity):
+    """Duration of the last update, with the coordinator's timings and counters.
+
+    Disabled by default. It polls the stats on Home Assistant's scan
+    interval instead of following the coordinator, which does not notify
+    listeners when the game data is unchanged.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_icon = "mdi:timer-outline"
+    # Only the duration is worth keeping in history; the rest changes on every poll
+    _unrecorded_attributes = frozenset(
+        {"count", "last_ms", "p50_ms", "p95_ms", "histogram_ms", "stages", "counters", "requests"}
+    )
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self.coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+        name = entry.data[CONF_NAME]
+        self._attr_name = f"{name} update time"
+        self._attr_unique_id = f"{slugify(name)}_{entry.entry_id}_update_time"
+
+    async def async_update(self) -> None:
+        """Read the latest stats."""
+        stats = self.coordinator.stats
+        updates = stats.as_dict()
+        self._attr_native_value = updates["updates"]["last_ms"]
+        self._attr_extra_state_attributes = {
+            **updates["updates"],
+            "stages": updates["stages"],
+            "counters": updates["counters"],
+            "requests": self.coordinator.hub.client.stats.as_dict(),
+        }
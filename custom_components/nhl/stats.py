@@ -0,0 +1,172 @@
+""" Timing and counters for the update path """
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+import aiohttp
+
+from .const import UPDATE_HISTOGRAM_BUCKETS, UPDATE_HISTORY
+
+
+class StageTimer:
+    """Last and cumulative durations of named stages, plus counters."""
+
+    def __init__(self):
+        """Initialize."""
+        self.counters = Counter()
+        self.last = {}
+        self._total = Counter()
+        self._calls = Counter()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counters[name] += amount
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one measurement of a stage."""
+        self.last[stage] = seconds
+        self._total[stage] += seconds
+        self._calls[stage] += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the body of a with block as one measurement of a stage."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def stages(self) -> dict:
+        """Return last and mean milliseconds for each stage."""
+        return {
+            stage: {
+                "last_ms": round(self.last[stage] * 1000, 3),
+                "mean_ms": round(self._total[stage] / self._calls[stage] * 1000, 3),
+                "count": self._calls[stage],
+            }
+            for stage in sorted(self.last)
+        }
+
+    def as_dict(self) -> dict:
+        """Return everything recorded, for diagnostics."""
+        return {"counters": dict(sorted(self.counters.items())), "stages": self.stages()}
+
+
+def stage(timer, name: str):
+    """Return timer.stage(name), or a no-op context when there is no timer."""
+    return nullcontext() if timer is None else timer.stage(name)
+
+
+class RequestStats(StageTimer):
+    """Network counters and stage timings of an NHLApiClient.
+
+    Connection-level stages (dns, connect, which includes the TLS
+    handshake, and response, the time to the response headers) come from
+    aiohttp's request tracing; add trace_config() to the session.
+    """
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Return a TraceConfig that records into these stats."""
+        trace = aiohttp.TraceConfig(trace_config_ctx_factory=self._trace_context)
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_dns_resolvehost_start.append(self._on_dns_start)
+        trace.on_dns_resolvehost_end.append(self._on_dns_end)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace.on_connection_create_start.append(self._on_connection_start)
+        trace.on_connection_create_end.append(self._on_connection_end)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+        return trace
+
+    @staticmethod
+    def _trace_context(trace_request_ctx=None):
+        return SimpleNamespace(started={}, trace_request_ctx=trace_request_ctx)
+
+    def _begin(self, context, name):
+        context.started[name] = time.perf_counter()
+
+    def _end(self, context, name):
+        started = context.started.pop(name, None)
+        if started is not None:
+            self.record(name, time.perf_counter() - started)
+
+    async def _on_request_start(self, session, context, params):
+        self.count("requests")
+        self._begin(context, "response")
+
+    async def _on_request_end(self, session, context, params):
+        self.count("status_%s" % params.response.status)
+        self._end(context, "response")
+
+    async def _on_request_exception(self, session, context, params):
+        self.count("request_errors")
+        context.started.pop("response", None)
+
+    async def _on_dns_start(self, session, context, params):
+        self._begin(context, "dns")
+
+    async def _on_dns_end(self, session, context, params):
+        self._end(context, "dns")
+
+    async def _on_dns_cache_hit(self, session, context, params):
+        self.count("dns_cache_hits")
+
+    async def _on_connection_start(self, session, context, params):
+        self._begin(context, "connect")
+
+    async def _on_connection_end(self, session, context, params):
+        self.count("connections_opened")
+        self._end(context, "connect")
+
+    async def _on_connection_reused(self, session, context, params):
+        self.count("connections_reused")
+
+
+class UpdateStats(StageTimer):
+    """Stage timings of one coordinator and the durations of its last updates."""
+
+    def __init__(self, size: int = UPDATE_HISTORY):
+        """Initialize."""
+        super().__init__()
+        self.durations = deque(maxlen=size)
+
+    def record_update(self, seconds: float, success: bool) -> None:
+        """Record a whole update."""
+        self.durations.append(seconds)
+        self.count("updates" if success else "failed_updates")
+
+    def histogram(self) -> dict:
+        """Return how many of the recent updates fell into each bucket, in ms."""
+        counts = dict.fromkeys(["<=%s" % bucket for bucket in UPDATE_HISTOGRAM_BUCKETS], 0)
+        counts[">%s" % UPDATE_HISTOGRAM_BUCKETS[-1]] = 0
+        for seconds in self.durations:
+            ms = seconds * 1000
+            for bucket in UPDATE_HISTOGRAM_BUCKETS:
+                if ms <= bucket:
+                    counts["<=%s" % bucket] += 1
+                    break
+            else:
+                counts[">%s" % UPDATE_HISTOGRAM_BUCKETS[-1]] += 1
+        return counts
+
+    def percentile(self, fraction: float):
+        """Return a percentile of the recent update durations in ms, or None."""
+        if not self.durations:
+            return None
+        ordered = sorted(self.durations)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000, 3)
+
+    def as_dict(self) -> dict:
+        """Return everything recorded, for diagnostics."""
+        data = super().as_dict()
+        data["updates"] = {
+            "count": len(self.durations),
+            "last_ms": round(self.durations[-1] * 1000, 3) if self.durations else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "histogram_ms": self.histogram(),
+        }
+        return data
@@ -0,0 +1,5 @@
+"""Make the integration importable as the top-level nhl package."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "custom_components"))
@@ -0,0 +1,151 @@
+"""Tests for the coordinator's state reuse, against recorded payloads."""
+import asyncio
+import copy
+import json
+import os
+
+from homeassistant.core import HomeAssistant
+
+from nhl.const import API_SCOREBOARD_ENDPOINT, API_TEAM_ENDPOINT, CONF_REQUESTS_PER_MINUTE
+from nhl.coordinator import AlertsDataUpdateCoordinator, async_get_state
+from nhl.hub import get_hub
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "benchmarks", "fixtures")
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+class FixtureResponse:
+    """Just enough of aiohttp.ClientResponse for NHLApiClient."""
+
+    def __init__(self, body):
+        self.status = 200 if body is not None else 404
+        self.headers = {}
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FixtureSession:
+    """Stand-in for the pooled session that answers from a dict of bodies."""
+
+    closed = False
+
+    def __init__(self, bodies):
+        self.bodies = bodies
+        self.requested = set()
+
+    def get(self, url, headers=None):
+        self.requested.add(url)
+        return FixtureResponse(self.bodies.get(url))
+
+    async def close(self):
+        self.closed = True
+
+
+# The request budget is not under test here
+UNLIMITED = 10 ** 9
+
+
+def config(team_id):
+    return {"team_id": team_id, "name": team_id, "timeout": 30, CONF_REQUESTS_PER_MINUTE: UNLIMITED}
+
+
+def with_odds(scoreboard, team_id, details):
+    """Return a copy of scoreboard with the odds of team_id's game replaced."""
+    scoreboard = copy.deepcopy(scoreboard)
+    for event in scoreboard["events"]:
+        if team_id in event["shortName"]:
+            event["competitions"][0]["odds"][0]["details"] = details
+    return scoreboard
+
+
+async def _tracking_another_team_keeps_revisions(config_dir):
+    hass = HomeAssistant(config_dir)
+    scoreboard = read_fixture("scoreboard_pre.json")
+    bodies = {API_SCOREBOARD_ENDPOINT: json.dumps(scoreboard).encode()}
+    hub = get_hub(hass, config("NYR"))
+    hub.client._session = FixtureSession(bodies)
+    try:
+        hub.track("NYR", UNLIMITED)
+        first = await async_get_state(hub, config("NYR"))
+
+        # A second entry is set up while the first team's game changes
+        bodies[API_SCOREBOARD_ENDPOINT] = json.dumps(with_odds(scoreboard, "NYR", "CHANGED")).encode()
+        hub.track("BOS", UNLIMITED)
+        await async_get_state(hub, config("BOS"))
+        second = await async_get_state(hub, config("NYR"), first)
+
+        assert second.source != first.source
+        assert second.odds != first.odds
+        assert "CHANGED" in second.odds
+    finally:
+        await hub.async_close()
+        await hass.async_stop(force=True)
+
+
+def test_tracking_another_team_keeps_revisions(tmp_path):
+    """The scoreboard refetched for a new team must not look unchanged to the others."""
+    asyncio.run(_tracking_another_team_keeps_revisions(str(tmp_path)))
+
+
+async def _bad_answers_keep_stale_data(config_dir, bodies, endpoint, answer):
+    hass = HomeAssistant(config_dir)
+    coordinator = AlertsDataUpdateCoordinator(hass, config("NYR"), 30)
+    hub = coordinator.hub
+    session = hub.client._session = FixtureSession(bodies)
+    try:
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+
+        for url in session.requested:
+            if url.startswith(endpoint):
+                bodies[url] = answer
+        hub._invalidate_scoreboard()
+        coordinator.data.source = None
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success
+        assert coordinator.data.stale
+        assert coordinator.failures == 1
+        # A 404 is an answer, not an outage
+        assert hub.breakers[endpoint].failures >= (answer is not None)
+    finally:
+        await hub.async_close()
+        await hass.async_stop(force=True)
+
+
+HTML = b"<html><body>Service Unavailable</body></html>"
+
+
+def test_html_scoreboard_keeps_stale_data(tmp_path):
+    """An error page in place of the scoreboard counts as a failed fetch, not a bug."""
+    bodies = {API_SCOREBOARD_ENDPOINT: json.dumps(read_fixture("scoreboard_pre.json")).encode()}
+    asyncio.run(_bad_answers_keep_stale_data(str(tmp_path), bodies, API_SCOREBOARD_ENDPOINT, HTML))
+
+
+def off_day_bodies():
+    return {
+        API_SCOREBOARD_ENDPOINT: json.dumps(read_fixture("scoreboard_off_day.json")).encode(),
+        API_TEAM_ENDPOINT + "NYR": json.dumps(read_fixture("team_off_day.json")).encode(),
+    }
+
+
+def test_html_team_document_keeps_stale_data(tmp_path):
+    """So does an error page in place of the team document."""
+    asyncio.run(_bad_answers_keep_stale_data(str(tmp_path), off_day_bodies(), API_TEAM_ENDPOINT, HTML))
+
+
+def test_missing_team_document_keeps_stale_data(tmp_path):
+    """And a team document that is not found."""
+    asyncio.run(_bad_answers_keep_stale_data(str(tmp_path), off_day_bodies(), API_TEAM_ENDPOINT, None))
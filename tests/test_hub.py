@@ -0,0 +1,29 @@
+"""Tests for the hub shared by every entry."""
+import asyncio
+
+from homeassistant.core import HomeAssistant
+
+from nhl.hub import get_hub
+
+
+async def _budget_follows_tracked_teams(config_dir):
+    hass = HomeAssistant(config_dir)
+    hub = get_hub(hass)
+    try:
+        hub.track("NYR", 30)
+        hub.track("BOS", 60)
+        assert hub.limiter.requests_per_minute == 30
+
+        # The entry that asked for less is removed or reloaded with more
+        hub.untrack("NYR")
+        assert hub.limiter.requests_per_minute == 60
+        hub.track("NYR", 120)
+        assert hub.limiter.requests_per_minute == 60
+    finally:
+        await hub.async_close()
+        await hass.async_stop(force=True)
+
+
+def test_budget_follows_tracked_teams(tmp_path):
+    """The lowest budget of the teams still tracked applies, so it can go back up."""
+    asyncio.run(_budget_follows_tracked_teams(str(tmp_path)))